@@ -0,0 +1,52 @@
+### AST MEMORY BENCHMARK
+#
+# Measures how many bytes the lexer keeps per token and the parser keeps per
+# AST node, using tracemalloc.
+#
+#     python -m benchmarks.ast_memory [statements]
+
+import sys
+import tracemalloc
+
+from components.lexer import Lexer
+from components.parser import Parser
+from bits.nodes import iter_nodes
+
+STATEMENT = 'var x{0} = (a + {0}) * f({0}, [1, 2, "s"]) - -b'
+
+def make_program(statements):
+    return "\n".join(STATEMENT.format(i) for i in range(statements))
+
+def measure(statements):
+    text = make_program(statements)
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    tokens, error = Lexer("<bench>", text).make_tokens()
+    if error: raise Exception(error.as_string())
+    after_lex = tracemalloc.get_traced_memory()[0]
+
+    tree = Parser(tokens).parse()
+    if tree.error: raise Exception(tree.error.as_string())
+    after_parse = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    node_count = sum(1 for _ in iter_nodes(tree.node))
+    return {
+        "statements": statements,
+        "tokens": len(tokens),
+        "nodes": node_count,
+        "bytes_per_token": (after_lex - base) / len(tokens),
+        "bytes_per_node": (after_parse - after_lex) / node_count,
+    }
+
+def main(argv):
+    statements = int(argv[0]) if argv else 20000
+    result = measure(statements)
+    print(f"{result['statements']} statements, {result['tokens']} tokens, {result['nodes']} nodes")
+    print(f"{result['bytes_per_token']:.1f} bytes per token")
+    print(f"{result['bytes_per_node']:.1f} bytes per node")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,141 @@
+### SYNTHETIC PROGRAM GENERATOR
+#
+# Valid BoringLang programs of a given size and shape, for measuring how the
+# lexer and parser scale. Programs are produced in chunks, so even the
+# largest can be written to a file without holding it in memory.
+#
+#     python -m benchmarks.generator SHAPE SIZE [PATH] [--depth N]
+#
+# SHAPE is one of SHAPES, SIZE a byte count such as 4096, 1KB, 10MB or 0.5GB.
+
+import sys
+import argparse
+
+SHAPES = ("statements", "nesting", "list", "string")
+
+# the parser recurses a dozen or more Python frames per nesting level, so
+# not much deeper than this hits Python's default recursion limit
+NESTING_DEPTH = 40
+
+CHUNK_SIZE = 1 << 16
+
+UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+def parse_size(text):
+    text = text.strip().upper()
+    for unit in ("KB", "MB", "GB", "B"):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * UNITS[unit])
+    return int(text)
+
+def format_size(size):
+    for unit in ("GB", "MB", "KB"):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return f"{size // UNITS[unit]}{unit}"
+    return f"{size}B"
+
+### SHAPES
+#
+# Each shape yields lines or pieces of one statement until asked to stop,
+# then closes whatever it has open.
+
+def statement_lines():
+    # a long list of short, unrelated statements
+    i = 0
+    while True:
+        yield f'var x{i} = (x{i // 2} + {i}) * 2 - [{i}, "s{i}"][0]\n' if i else 'var x0 = 1\n'
+        i += 1
+
+def nesting_lines(depth):
+    # every statement nested depth levels deep, alternating parentheses and
+    # if expressions
+    i = 0
+    while True:
+        expr = str(i)
+        for level in range(depth):
+            if level % 2:
+                expr = f"(if {level} > 0 then {expr} else 0)"
+            else:
+                expr = f"({expr} + {level})"
+        yield f"var n{i} = {expr}\n"
+        i += 1
+
+def list_pieces():
+    # one list literal with as many elements as fit
+    yield "var xs = ["
+    i = 0
+    while True:
+        yield f"{i}, "
+        i += 1
+
+def string_pieces():
+    # one string literal of ordinary and escaped characters
+    yield 'var s = "'
+    piece = "abcdefghijklmnopqrstuvwxyz \\n\\t\\\" 0123456789 "
+    while True:
+        yield piece
+
+ENDINGS = {
+    "statements": "",
+    "nesting": "",
+    "list": "0]\n",
+    "string": '"\n'
+}
+
+def iter_program(shape, size, depth=NESTING_DEPTH):
+    # chunks of about CHUNK_SIZE characters adding up to roughly size
+    if shape == "statements":
+        pieces = statement_lines()
+    elif shape == "nesting":
+        pieces = nesting_lines(depth)
+    elif shape == "list":
+        pieces = list_pieces()
+    elif shape == "string":
+        pieces = string_pieces()
+    else:
+        raise ValueError(f"unknown shape '{shape}', expected one of {', '.join(SHAPES)}")
+
+    ending = ENDINGS[shape]
+    budget = max(size - len(ending), 0)
+    written = 0
+    chunk = []
+    chunk_length = 0
+
+    for piece in pieces:
+        if written + chunk_length + len(piece) > budget and written + chunk_length > 0: break
+
+        chunk.append(piece)
+        chunk_length += len(piece)
+        if chunk_length >= CHUNK_SIZE:
+            yield "".join(chunk)
+            written += chunk_length
+            chunk = []
+            chunk_length = 0
+
+    chunk.append(ending)
+    yield "".join(chunk)
+
+def generate(shape, size, depth=NESTING_DEPTH):
+    return "".join(iter_program(shape, size, depth))
+
+def write_program(path, shape, size, depth=NESTING_DEPTH):
+    with open(path, "w") as f:
+        for chunk in iter_program(shape, size, depth):
+            f.write(chunk)
+
+def main(argv):
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.generator", description="Write a synthetic BoringLang program.")
+    arg_parser.add_argument("shape", choices=SHAPES)
+    arg_parser.add_argument("size", type=parse_size, help="approximate size, e.g. 1KB, 10MB or 500MB")
+    arg_parser.add_argument("path", nargs="?", help="file to write (default stdout)")
+    arg_parser.add_argument("--depth", type=int, default=NESTING_DEPTH, help="nesting depth of the nesting shape (default %(default)s)")
+    args = arg_parser.parse_args(argv)
+
+    if args.path:
+        write_program(args.path, args.shape, args.size, args.depth)
+    else:
+        for chunk in iter_program(args.shape, args.size, args.depth):
+            sys.stdout.write(chunk)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,59 @@
+### BENCHMARK PROGRAMS
+#
+# Representative BoringLang programs, each stressing one part of the
+# lexer, parser or interpreter. None of them print.
+
+FIB = """
+fn fib(n) -> if n < 2 then n else fib(n-1) + fib(n-2)
+fib(17)
+"""
+
+NESTED_FOR = """
+var total = 0
+for i = 0 to 120 do
+    for j = 0 to 120 do
+        var total = total + i * j - j
+    end
+end
+total
+"""
+
+LIST_BUILDING = """
+var xs = []
+for i = 0 to 15000 do var xs = xs + i * 2
+var ys = map(xs, fn (x) -> x + 1)
+sum(ys)
+"""
+
+STRING_CONCAT = """
+var s = ""
+for i = 0 to 15000 do var s = s + "ab"
+var t = ""
+for c in "the quick brown fox jumps over the lazy dog" do var t = c + t
+t
+"""
+
+CLOSURES = """
+fn scale(xs, k) -> map(xs, fn (x) -> x * k + 1)
+fn outer(n) -> (fn (x) -> x * n + 1)(n)
+var total = 0
+for i = 0 to 2000 do var total = total + outer(i)
+for i = 0 to 200 do var total = total + sum(scale([1, 2, 3, 4, 5], i))
+total
+"""
+
+def literal_list(count):
+    numbers = ", ".join(str(i) for i in range(count))
+    strings = ", ".join(f'"item{i}"' for i in range(count // 4))
+    return f"var numbers = [{numbers}]\nvar strings = [{strings}]\nsum(numbers)\n"
+
+LARGE_LITERAL_LIST = literal_list(20000)
+
+PROGRAMS = {
+    "fib" : FIB,
+    "nested_for" : NESTED_FOR,
+    "list_building" : LIST_BUILDING,
+    "string_concat" : STRING_CONCAT,
+    "closures" : CLOSURES,
+    "large_literal_list" : LARGE_LITERAL_LIST
+}
\ No newline at end of file
@@ -0,0 +1,129 @@
+### FRONT-END SCALING
+#
+# Lexes and parses synthetic programs (see benchmarks/generator.py) of
+# growing size, recording the time and tracemalloc peak of each phase. The
+# exponent column compares each size with the one before it: time growing
+# like size^1 is linear, and anything well above that is worth a look.
+#
+#     python -m benchmarks.scaling [--shapes SHAPE ...] [--sizes 1KB 10KB ...] [--depth N] [--no-memory] [-o results.json]
+
+import gc
+import sys
+import json
+import math
+import time
+import argparse
+import tracemalloc
+
+from components.lexer import Lexer
+from components.parser import Parser
+from benchmarks.generator import SHAPES, NESTING_DEPTH, generate, parse_size, format_size
+
+SIZES = ("1KB", "10KB", "100KB", "1MB")
+PHASES = ("lex", "parse")
+
+# exponents above this are reported as super-linear
+SUPER_LINEAR = 1.2
+
+def run_phases(text):
+    # seconds per phase; raises on a lexer or parser error
+    start = time.perf_counter()
+    tokens, error = Lexer("<scaling>", text).make_tokens()
+    lexed = time.perf_counter()
+    if error: raise Exception(error.as_string())
+
+    tree = Parser(tokens).parse()
+    parsed = time.perf_counter()
+    if tree.error: raise Exception(tree.error.as_string())
+
+    return {"lex": lexed - start, "parse": parsed - lexed}, len(tokens)
+
+def measure_memory(text):
+    # peak bytes traced during each phase, over what was allocated before it
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        tokens, error = Lexer("<scaling>", text).make_tokens()
+        lex_peak = tracemalloc.get_traced_memory()[1] - before
+        if error: raise Exception(error.as_string())
+
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        tree = Parser(tokens).parse()
+        parse_peak = tracemalloc.get_traced_memory()[1] - before
+        if tree.error: raise Exception(tree.error.as_string())
+    finally:
+        tracemalloc.stop()
+
+    return {"lex": lex_peak, "parse": parse_peak}
+
+def measure(shape, size, depth, memory):
+    text = generate(shape, size, depth)
+    result = {"shape": shape, "size": len(text)}
+
+    try:
+        result["seconds"], result["tokens"] = run_phases(text)
+        gc.collect()
+        if memory:
+            result["peak_bytes"] = measure_memory(text)
+    except RecursionError:
+        result["error"] = "recursion limit"
+    except Exception as error:
+        result["error"] = str(error).splitlines()[0]
+
+    gc.collect()
+    return result
+
+def exponent(previous, current, phase):
+    # how time grows with size between two measurements of one shape
+    if "seconds" not in previous or "seconds" not in current: return None
+
+    old, new = previous["seconds"][phase], current["seconds"][phase]
+    if old <= 0 or new <= 0 or current["size"] == previous["size"]: return None
+    return math.log(new / old) / math.log(current["size"] / previous["size"])
+
+def format_row(result, previous):
+    if "error" in result:
+        return f"{result['shape']:<12} {format_size(result['size']):>8}  {result['error']}"
+
+    cells = []
+    for phase in PHASES:
+        cell = f"{result['seconds'][phase]:>9.4f}s"
+        if "peak_bytes" in result:
+            cell += f" {result['peak_bytes'][phase] / (1 << 20):>9.2f}MB"
+
+        growth = exponent(previous, result, phase) if previous else None
+        if growth is None:
+            cell += " " * 10
+        else:
+            cell += f"  n^{growth:<4.2f}" + ("!" if growth > SUPER_LINEAR else " ")
+        cells.append(cell)
+
+    return f"{result['shape']:<12} {format_size(result['size']):>8}  " + "  ".join(cells)
+
+def main(argv):
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.scaling", description="Measure how lexing and parsing scale with program size.")
+    arg_parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    arg_parser.add_argument("--sizes", nargs="+", type=parse_size, default=[parse_size(size) for size in SIZES], help="program sizes, e.g. 1KB 10MB 500MB")
+    arg_parser.add_argument("--depth", type=int, default=NESTING_DEPTH, help="nesting depth of the nesting shape (default %(default)s)")
+    arg_parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the tracemalloc pass, which is slower than the timed one")
+    arg_parser.add_argument("-o", "--output", metavar="PATH", help="write the results as JSON to PATH")
+    args = arg_parser.parse_args(argv)
+
+    results = []
+    print(f"{'shape':<12} {'size':>8}  " + "  ".join(f"{phase + (' time / peak / growth' if args.memory else ' time / growth'):<31}" for phase in PHASES))
+    for shape in args.shapes:
+        previous = None
+        for size in sorted(args.sizes):
+            result = measure(shape, size, args.depth, args.memory)
+            print(format_row(result, previous), flush=True)
+            results.append(result)
+            previous = result
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"depth": args.depth, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,167 @@
+### BENCHMARK SUITE
+#
+# Times Lexer.make_tokens, Parser.parse and Interpreter.visit separately for
+# every program in benchmarks/programs.py, and compares two result files.
+#
+#     python -m benchmarks.suite run [-o results.json] [--repeat N] [--warmup N] [--only NAME ...]
+#     python -m benchmarks.suite compare baseline.json results.json [--threshold 0.05]
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+
+import boring
+from components.lexer import Lexer
+from components.parser import Parser
+from components.inliner import Inliner
+from components.inference import TypeInferrer
+from components.runtime import Runtime
+from bits.misc import Context, SymbolTable
+from benchmarks.programs import PROGRAMS
+
+PHASES = ("lex", "parse", "execute")
+
+def run_once(name, text):
+    # one full pipeline over fresh tokens and a fresh tree, so nothing the
+    # interpreter caches on nodes carries over between repeats
+    start = time.perf_counter()
+    tokens, error = Lexer(f"<{name}>", text).make_tokens()
+    lexed = time.perf_counter()
+    if error: raise Exception(error.as_string())
+
+    tree = Parser(tokens).parse()
+    parsed = time.perf_counter()
+    if tree.error: raise Exception(tree.error.as_string())
+
+    Inliner().inline(tree.node)
+    TypeInferrer().infer(tree.node)
+
+    # program variables go in their own scope so repeats start clean
+    context = Context('<program>')
+    context.symbol_table = SymbolTable(boring.global_symbol_table)
+    runtime = Runtime(context.symbol_table)
+
+    executing = time.perf_counter()
+    result = runtime.execute(tree.node, context)
+    executed = time.perf_counter()
+    if result.error: raise Exception(result.error.as_string())
+
+    return {"lex": lexed - start, "parse": parsed - lexed, "execute": executed - executing}
+
+def summarise(samples):
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "max": max(samples),
+        "samples": samples
+    }
+
+def benchmark(name, text, repeat, warmup):
+    for _ in range(warmup):
+        run_once(name, text)
+
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        for phase, seconds in run_once(name, text).items():
+            samples[phase].append(seconds)
+    return {phase: summarise(samples[phase]) for phase in PHASES}
+
+def run_suite(names, repeat, warmup, log=None):
+    results = {}
+    for name in names:
+        results[name] = benchmark(name, PROGRAMS[name], repeat, warmup)
+        if log:
+            log(format_row(name, results[name]))
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "results": results
+    }
+
+def format_row(name, phases):
+    cells = "  ".join(
+        f"{phases[phase]['median'] * 1000:>9.3f}ms ±{phases[phase]['stdev'] * 1000:>7.3f}" for phase in PHASES
+    )
+    return f"{name:<20}  {cells}"
+
+### COMPARE
+
+def compare(baseline, current, threshold):
+    # median of every phase against the baseline; a phase regresses when it
+    # is more than threshold slower and the gap is wider than the noise of
+    # both runs
+    rows = []
+    regressions = []
+
+    for name, phases in current["results"].items():
+        if name not in baseline["results"]: continue
+
+        for phase in PHASES:
+            old = baseline["results"][name][phase]
+            new = phases[phase]
+            change = (new["median"] - old["median"]) / old["median"] if old["median"] else 0.0
+            noise = old["stdev"] + new["stdev"]
+
+            status = ""
+            if change > threshold and new["median"] - old["median"] > noise:
+                status = "REGRESSION"
+                regressions.append((name, phase))
+            elif change < -threshold and old["median"] - new["median"] > noise:
+                status = "faster"
+
+            rows.append(
+                f"{name:<20} {phase:<8} {old['median'] * 1000:>10.3f}ms {new['median'] * 1000:>10.3f}ms {change * 100:>+8.1f}%  {status}"
+            )
+
+    return rows, regressions
+
+### COMMAND LINE
+
+def main(argv):
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description="Benchmark the lexer, parser and interpreter.")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", metavar="PATH", help="write the results as JSON to PATH")
+    run_parser.add_argument("--repeat", type=int, default=10, help="timed runs per program (default %(default)s)")
+    run_parser.add_argument("--warmup", type=int, default=2, help="untimed runs first (default %(default)s)")
+    run_parser.add_argument("--only", nargs="+", choices=sorted(PROGRAMS), metavar="NAME", help="programs to run")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.05, help="slowdown that counts as a regression (default %(default)s)")
+
+    args = arg_parser.parse_args(argv)
+
+    if args.command == "run":
+        print(f"{'program':<20}  " + "  ".join(f"{phase + ' median':>20}" for phase in PHASES))
+        suite = run_suite(args.only or list(PROGRAMS), args.repeat, args.warmup, log=print)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(suite, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows, regressions = compare(baseline, current, args.threshold)
+    print(f"{'program':<20} {'phase':<8} {'baseline':>12} {'current':>12} {'change':>9}")
+    print("\n".join(rows))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): " + ", ".join(f"{name} {phase}" for name, phase in regressions))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
\ No newline at end of file
@@ -4,6 +4,61 @@ DIGITS = "0123456789"
 LETTERS = string.ascii_letters
 LETTERS_DIGITS = LETTERS + DIGITS + "_"
 
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+
+QUICKEN_WARMUP = 8
+QUICKEN_MAX_DEOPTS = 4
+
+INLINE_MAX_NODES = 24
+
+# approximate bytes a list element costs against a run's memory limit
+LIST_ELEMENT_BYTES = 8
+# steps between two reads of the clock when a run has a time limit
+DEADLINE_CHECK_STEPS = 32
+# elements a builtin such as sum or map goes through between two checks
+# of a run's limits
+BUILTIN_CHECK_ELEMENTS = 1024
+# steps a run_async program takes before giving the event loop a turn
+ASYNC_YIELD_STEPS = 1000
+# steps a green task takes before another ready task gets a turn
+TASK_SLICE_STEPS = 100
+# characters of printed output held before they are written out
+OUTPUT_BUFFER_SIZE = 1 << 16
+# seconds printed output may wait before a print writes it out
+OUTPUT_FLUSH_INTERVAL = 0.1
+# bytes of input read from a stream at once
+INPUT_CHUNK_SIZE = 1 << 16
+# files at least this large are memory-mapped by read_file()
+MMAP_THRESHOLD = 1 << 20
+# characters encoded and written to a file at once
+WRITE_CHUNK_SIZE = 1 << 16
+
+# builtins with side effects; functions calling them are never memoized
+IMPURE_BUILTINS = [
+    "print",
+    "input",
+    "input_int",
+    "clear",
+    "set",
+    "delete",
+    "sort",
+    "send",
+    "receive",
+    "close",
+    "join",
+    "sleep",
+    "flush",
+    "read_lines",
+    "read_all",
+    "read_ints",
+    "read_file",
+    "write_file",
+    "append_file",
+    "open_lines",
+    "open_json_items"
+]
+
 T_INT = "INT"
 T_FLOAT = "FLOAT"
 T_STRING = "STRING"
@@ -27,6 +82,9 @@ T_LPAREN = "LPAREN"
 T_RPAREN = "RPAREN"
 T_LSQUARE = "LSQUARE"
 T_RSQUARE = "RSQUARE"
+T_LBRACE = "LBRACE"
+T_RBRACE = "RBRACE"
+T_COLON = "COLON"
 T_COMMA = "COMMA"
 T_ARROW = "ARROW"
 T_NEWLINE = "NEWLINE"
@@ -43,11 +101,14 @@ KEYWORDS = [
     'else',
     'for',
     'to',
+    'in',
     'do',
     'step',
     'while',
     'fn',
-    'end'
+    'end',
+    'spawn',
+    'await'
 ]
 
 TokenReference = {
@@ -60,6 +121,9 @@ TokenReference = {
     ")" : T_RPAREN,
     "[" : T_LSQUARE,
     "]" : T_RSQUARE,
+    "{" : T_LBRACE,
+    "}" : T_RBRACE,
+    ":" : T_COLON,
     "=" : T_EQUALS,
     "," : T_COMMA
 }
\ No newline at end of file
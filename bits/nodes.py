@@ -1,48 +1,94 @@
 class NumberNode:
+    __slots__ = ('tok', 'pos_start', 'pos_end', 'value')
+
     def __init__(self, token):
         self.tok = token
         self.pos_start = self.tok.pos_start
         self.pos_end = self.tok.pos_end
+        self.value = None
     
     def __repr__(self):
         return f'{self.tok}'
 
+    def children(self):
+        return []
+
 class StringNode:
+    __slots__ = ('tok', 'pos_start', 'pos_end', 'value')
+
     def __init__(self, token):
         self.tok = token
         self.pos_start = self.tok.pos_start
         self.pos_end = self.tok.pos_end
+        self.value = None
     
     def __repr__(self):
         return f'{self.tok}'
 
+    def children(self):
+        return []
+
 class ListNode:
+    __slots__ = ('element_nodes', 'pos_start', 'pos_end')
+
     def __init__(self, element_nodes, pos_start, pos_end):
         self.element_nodes = element_nodes
 
         self.pos_start = pos_start
         self.pos_end = pos_end
 
+    def children(self):
+        return self.element_nodes
+
+class MapNode:
+    __slots__ = ('entry_nodes', 'pos_start', 'pos_end')
+
+    def __init__(self, entry_nodes, pos_start, pos_end):
+        self.entry_nodes = entry_nodes
+
+        self.pos_start = pos_start
+        self.pos_end = pos_end
+
+    def children(self):
+        nodes = []
+        for key_node, value_node in self.entry_nodes:
+            nodes.append(key_node)
+            nodes.append(value_node)
+        return nodes
+
 class VarAccessNode:
+    __slots__ = ('var_name_tok', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok):
         self.var_name_tok = var_name_tok
 
         self.pos_start = var_name_tok.pos_start
         self.pos_end = var_name_tok.pos_end
 
+    def children(self):
+        return []
+
 class VarAssignNode:
+    __slots__ = ('var_name_tok', 'value_node', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, value_node):
         self.var_name_tok = var_name_tok
         self.value_node = value_node
         
         self.pos_start = var_name_tok.pos_start
         self.pos_end = var_name_tok.pos_end
-    
+
+    def children(self):
+        return [self.value_node]
+
 class BinOpNode:
+    __slots__ = ('left', 'op_tok', 'right', 'pos_start', 'pos_end', 'site')
+
     def __init__(self, left, op_tok, right):
         self.left = left
         self.op_tok = op_tok
         self.right = right
+        self.site = None
 
         self.pos_start = self.left.pos_start
         self.pos_end = self.right.pos_end
@@ -50,7 +96,12 @@ class BinOpNode:
     def __repr__(self):
         return f'({self.left}, {self.op_tok}, {self.right})'
 
+    def children(self):
+        return [self.left, self.right]
+
 class UnaryOpNode:
+    __slots__ = ('op_tok', 'node', 'pos_start', 'pos_end')
+
     def __init__(self, op_tok, node):
         self.op_tok = op_tok
         self.node = node
@@ -61,7 +112,12 @@ class UnaryOpNode:
     def __repr__(self):
         return f"({self.op_tok}, {self.node})"
 
+    def children(self):
+        return [self.node]
+
 class IfNode:
+    __slots__ = ('cases', 'else_case', 'pos_start', 'pos_end')
+
     def __init__(self, cases, else_case):
         self.cases = cases
         self.else_case = else_case
@@ -69,7 +125,18 @@ class IfNode:
         self.pos_start = self.cases[0][0].pos_start
         self.pos_end = (self.else_case or self.cases[-1])[0].pos_end
 
+    def children(self):
+        nodes = []
+        for condition, expr, _ in self.cases:
+            nodes.append(condition)
+            nodes.append(expr)
+        if self.else_case:
+            nodes.append(self.else_case[0])
+        return nodes
+
 class ForNode:
+    __slots__ = ('var_name_tok', 'start_value_node', 'end_value_node', 'step_value_node', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, start_value_node, end_value_node, step_value_node, body_node, should_return_null):
         self.var_name_tok = var_name_tok
         self.start_value_node = start_value_node
@@ -81,7 +148,31 @@ class ForNode:
         self.pos_start = self.var_name_tok.pos_start
         self.pos_end = self.body_node.pos_end
 
+    def children(self):
+        nodes = [self.start_value_node, self.end_value_node]
+        if self.step_value_node:
+            nodes.append(self.step_value_node)
+        nodes.append(self.body_node)
+        return nodes
+
+class ForInNode:
+    __slots__ = ('var_name_tok', 'iterable_node', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
+    def __init__(self, var_name_tok, iterable_node, body_node, should_return_null):
+        self.var_name_tok = var_name_tok
+        self.iterable_node = iterable_node
+        self.body_node = body_node
+        self.should_return_null = should_return_null
+
+        self.pos_start = self.var_name_tok.pos_start
+        self.pos_end = self.body_node.pos_end
+
+    def children(self):
+        return [self.iterable_node, self.body_node]
+
 class WhileNode:
+    __slots__ = ('condition_node', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
     def __init__(self, condition_node, body_node, should_return_null):
         self.condition_node = condition_node
         self.body_node = body_node
@@ -90,7 +181,12 @@ class WhileNode:
         self.pos_start = self.condition_node.pos_start
         self.pos_end = self.body_node.pos_start
 
+    def children(self):
+        return [self.condition_node, self.body_node]
+
 class FuncDefNode:
+    __slots__ = ('var_name_tok', 'arg_name_toks', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
     def __init__(self, var_name_tok, arg_name_toks, body_node, should_return_null):
         self.var_name_tok = var_name_tok
         self.arg_name_toks = arg_name_toks
@@ -106,14 +202,98 @@ class FuncDefNode:
         
         self.pos_end = self.body_node.pos_end
 
+    def children(self):
+        return [self.body_node]
+
 class CallNode:
+    __slots__ = ('node_to_call', 'arg_nodes', 'pos_start', 'pos_end', 'inline')
+
     def __init__(self, node_to_call, arg_nodes):
         self.node_to_call = node_to_call
         self.arg_nodes = arg_nodes
+        self.inline = None
 
         self.pos_start = self.node_to_call.pos_start
 
         if len(self.arg_nodes) > 0:
             self.pos_end = self.arg_nodes[-1].pos_end
         else:
-            self.pos_end = self.node_to_call.pos_end
\ No newline at end of file
+            self.pos_end = self.node_to_call.pos_end
+
+    def children(self):
+        return [self.node_to_call] + self.arg_nodes
+
+class IndexNode:
+    __slots__ = ('node', 'index_node', 'pos_start', 'pos_end')
+
+    def __init__(self, node, index_node, pos_end):
+        self.node = node
+        self.index_node = index_node
+
+        self.pos_start = self.node.pos_start
+        self.pos_end = pos_end
+
+    def children(self):
+        return [self.node, self.index_node]
+
+class SliceNode:
+    __slots__ = ('node', 'start_node', 'end_node', 'pos_start', 'pos_end')
+
+    def __init__(self, node, start_node, end_node, pos_end):
+        self.node = node
+        self.start_node = start_node
+        self.end_node = end_node
+
+        self.pos_start = self.node.pos_start
+        self.pos_end = pos_end
+
+    def children(self):
+        return [node for node in (self.node, self.start_node, self.end_node) if node]
+
+class IndexAssignNode:
+    __slots__ = ('index_node', 'value_node', 'pos_start', 'pos_end')
+
+    def __init__(self, index_node, value_node):
+        self.index_node = index_node
+        self.value_node = value_node
+
+        self.pos_start = self.index_node.pos_start
+        self.pos_end = self.value_node.pos_end
+
+    def children(self):
+        return [self.index_node, self.value_node]
+
+class SpawnNode:
+    __slots__ = ('spawn_tok', 'call_node', 'pos_start', 'pos_end')
+
+    def __init__(self, spawn_tok, call_node):
+        self.spawn_tok = spawn_tok
+        self.call_node = call_node
+
+        self.pos_start = self.spawn_tok.pos_start
+        self.pos_end = self.call_node.pos_end
+
+    def children(self):
+        return [self.call_node]
+
+class AwaitNode:
+    __slots__ = ('await_tok', 'node', 'pos_start', 'pos_end')
+
+    def __init__(self, await_tok, node):
+        self.await_tok = await_tok
+        self.node = node
+
+        self.pos_start = self.await_tok.pos_start
+        self.pos_end = self.node.pos_end
+
+    def children(self):
+        return [self.node]
+
+### TREE WALKING
+
+def iter_nodes(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children())
\ No newline at end of file
@@ -1,6 +1,8 @@
 ### POSITION
 
 class Position:
+    __slots__ = ('index', 'ln', 'col', 'filename', 'filetext')
+
     def __init__(self, index, ln, col, filename, filetext):
         self.index = index
         self.ln = ln
@@ -1,6 +1,8 @@
 ### TOKEN
 
 class Token:
+    __slots__ = ('type', 'value', 'pos_start', 'pos_end')
+
     def __init__(self, type, value=None, pos_start=None, pos_end=None):
         self.type = type
         self.value = value
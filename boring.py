@@ -1,9 +1,24 @@
-from components.interpreter import Interpreter
+import sys
+import inspect
+from components.runtime import Runtime
+from components.profiler import Profiler
+from components.sampler import Sampler, SAMPLE_INTERVAL
+from components.metrics import Metrics, prometheus_text
+from components.limits import Limits
+from components.async_driver import AsyncDriver
+from components.parallel import ParallelRunner
+from components.output import OutputSink
+from components.input import InputSource, stdin
+from components.files import FileAccess
 from components.parser import Parser
 from components.lexer import Lexer
+from components.inference import TypeInferrer, explain_types
+from components.inliner import Inliner
 from bits.misc import *
 from values.types import Number
-from values.types import BuiltInFunction
+from values.types import BuiltInFunction, AsyncBuiltInFunction
+from values.base import BaseFunction
+from bits.constants import ASYNC_YIELD_STEPS
 
 ### RUN
 global_symbol_table = SymbolTable()
@@ -13,26 +28,161 @@ global_symbol_table.set("true", Number.true)
 
 global_symbol_table.set("print", BuiltInFunction.print)
 global_symbol_table.set("print_ret", BuiltInFunction.print_ret)
+global_symbol_table.set("flush", BuiltInFunction.flush)
 global_symbol_table.set("input", BuiltInFunction.input)
 global_symbol_table.set("input_int", BuiltInFunction.input_int)
+global_symbol_table.set("read_lines", BuiltInFunction.read_lines)
+global_symbol_table.set("read_all", BuiltInFunction.read_all)
+global_symbol_table.set("read_ints", BuiltInFunction.read_ints)
+global_symbol_table.set("read_file", BuiltInFunction.read_file)
+global_symbol_table.set("write_file", BuiltInFunction.write_file)
+global_symbol_table.set("append_file", BuiltInFunction.append_file)
+global_symbol_table.set("open_lines", BuiltInFunction.open_lines)
+global_symbol_table.set("json_parse", BuiltInFunction.json_parse)
+global_symbol_table.set("json_dump", BuiltInFunction.json_dump)
+global_symbol_table.set("json_items", BuiltInFunction.json_items)
+global_symbol_table.set("open_json_items", BuiltInFunction.open_json_items)
 global_symbol_table.set("clear", BuiltInFunction.clear)
+global_symbol_table.set("sum", BuiltInFunction.sum)
+global_symbol_table.set("min", BuiltInFunction.min)
+global_symbol_table.set("max", BuiltInFunction.max)
+global_symbol_table.set("mean", BuiltInFunction.mean)
+global_symbol_table.set("dot", BuiltInFunction.dot)
+global_symbol_table.set("count", BuiltInFunction.count)
+global_symbol_table.set("map", BuiltInFunction.map)
+global_symbol_table.set("filter", BuiltInFunction.filter)
+global_symbol_table.set("reduce", BuiltInFunction.reduce)
+global_symbol_table.set("sort", BuiltInFunction.sort)
+global_symbol_table.set("sorted", BuiltInFunction.sorted)
+global_symbol_table.set("has", BuiltInFunction.has)
+global_symbol_table.set("get", BuiltInFunction.get)
+global_symbol_table.set("set", BuiltInFunction.set)
+global_symbol_table.set("delete", BuiltInFunction.delete)
+global_symbol_table.set("keys", BuiltInFunction.keys)
+global_symbol_table.set("values", BuiltInFunction.values)
+global_symbol_table.set("items", BuiltInFunction.items)
+global_symbol_table.set("range", BuiltInFunction.range)
+global_symbol_table.set("memoize", BuiltInFunction.memoize)
+global_symbol_table.set("memo_stats", BuiltInFunction.memo_stats)
+global_symbol_table.set("sleep", BuiltInFunction.sleep)
+global_symbol_table.set("join", BuiltInFunction.join)
+global_symbol_table.set("channel", BuiltInFunction.channel)
+global_symbol_table.set("send", BuiltInFunction.send)
+global_symbol_table.set("receive", BuiltInFunction.receive)
+global_symbol_table.set("close", BuiltInFunction.close)
 
-def run(filename, text):
+def run(filename, text, profile=False, metrics=None, limits=None, output=None, input=None, files=None):
+    # profile=True prints a profile of the run to stderr; pass a Profiler
+    # instead to read its report() and collapsed() stacks afterwards.
+    # metrics=True, or a Metrics to add this run to, returns the metrics as
+    # a third value next to the result and error. limits is a Limits that
+    # fails the run with a RuntimeError once it takes too long or too much.
+    # output is the OutputSink print() writes to and input the InputSource
+    # input() and the read_* builtins read from, stdout and stdin by default.
+    # files is a FileAccess restricting what the file builtins may open
+    profiler = None
+    if profile:
+        profiler = profile if isinstance(profile, Profiler) else Profiler()
+    if metrics is True:
+        metrics = Metrics()
+
+    value, error = run_program(filename, text, profiler, metrics, limits, output=output, input=input, files=files)
+
+    if profile is True:
+        print(profiler.report(), file=sys.stderr)
+    if metrics is not None:
+        return value, error, metrics
+    return value, error
+
+def run_program(filename, text, profiler, metrics, limits, symbol_table=global_symbol_table, driver=None, output=None, input=None, files=None):
+    node, error = compile_program(filename, text, metrics)
+    if error: return None, error
+    return execute_program(node, profiler, metrics, limits, symbol_table, driver, output, input, files)
+
+def compile_program(filename, text, metrics=None):
+    # the analysed syntax tree of a program, ready for execute_program
+    if metrics: metrics.start()
     lexer = Lexer(filename, text)
     tokens, error = lexer.make_tokens()
     #print(tokens)
+    if metrics: metrics.stop('lex')
 
     if error: return None, error
 
     ## syntax tree
+    if metrics:
+        metrics.count_tokens(tokens)
+        metrics.start()
     parser = Parser(tokens)
     tree = parser.parse()
+    if metrics: metrics.stop('parse')
     if tree.error: return None, tree.error
 
-    # run
-    interpreter = Interpreter()
+    if metrics:
+        metrics.count_nodes(tree.node)
+        metrics.start()
+
+    # substitute small functions into their call sites, then prove what
+    # types it can so proven operations skip their checks
+    Inliner().inline(tree.node)
+    TypeInferrer().infer(tree.node)
+    if metrics: metrics.stop('analyse')
+
+    return tree.node, None
+
+def execute_program(node, profiler, metrics, limits, symbol_table=global_symbol_table, driver=None, output=None, input=None, files=None):
+    runtime = Runtime(symbol_table, output, input, files)
     context = Context('<program>')
-    context.symbol_table = global_symbol_table
-    result = interpreter.visit(tree.node, context)
+    context.symbol_table = symbol_table
+
+    if profiler: profiler.attach(runtime)
+    if metrics:
+        metrics.attach(runtime)
+        metrics.start()
+    if limits: limits.attach(runtime)
+    if driver: driver.attach(runtime)
+    try:
+        result = runtime.execute(node, context)
+    finally:
+        if driver: driver.detach()
+        if limits: limits.detach()
+        if metrics:
+            metrics.stop('execute')
+            metrics.detach()
+        if profiler: profiler.detach()
+
+    return result.value, result.error
+
+async def run_async(filename, text, yield_every=ASYNC_YIELD_STEPS, builtins=None, limits=None, output=None, input=None, files=None):
+    # run() for asyncio code: the program gives the event loop back every
+    # yield_every calls and loop iterations. builtins maps names to extra
+    # functions for this run, where coroutine functions become async
+    # builtins; TypeError for anything else that is not a function value.
+    # Each run gets its own variables on top of the global ones
+    symbol_table = SymbolTable(global_symbol_table)
+    for name, function in (builtins or {}).items():
+        if not isinstance(function, BaseFunction):
+            if not inspect.iscoroutinefunction(function):
+                raise TypeError(f"builtin '{name}' must be a coroutine function or a BoringLang function, not {function!r}")
+            function = AsyncBuiltInFunction(name, function)
+        symbol_table.set(name, function)
+
+    driver = AsyncDriver(yield_every)
+    return await driver.run(
+        lambda: run_program(filename, text, None, None, limits, symbol_table, driver, output, input, files)
+    )
+
+def run_parallel(programs, workers=None, backend='auto', limits=None):
+    # runs (filename, text) programs at the same time, each with its own
+    # variables, and returns (value, error text) for each in order. See
+    # ParallelRunner for the backends
+    return ParallelRunner(workers, backend, limits).run(programs)
+
+def explain(filename, text):
+    tokens, error = Lexer(filename, text).make_tokens()
+    if error: return None, error
+
+    tree = Parser(tokens).parse()
+    if tree.error: return None, tree.error
 
-    return result.value, result.error
\ No newline at end of file
+    return explain_types(tree.node), None
\ No newline at end of file
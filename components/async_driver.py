@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from bits.constants import ASYNC_YIELD_STEPS
+
+class RunCancelled(Exception):
+    # raised inside a run whose run_async task was cancelled, to unwind it
+    pass
+
+### ASYNC DRIVER
+
+class AsyncDriver:
+    # Runs one program cooperatively on an asyncio event loop.
+    #
+    # The interpreter is recursive, so a run cannot be suspended in the
+    # middle by an ordinary coroutine. Instead it runs on a helper thread
+    # that only ever executes while the event loop waits for it: the loop
+    # hands it a slice, blocks until the run pauses, and takes over again.
+    # The run pauses every yield_every steps (function calls and loop
+    # iterations), letting the loop run other tasks before the next slice,
+    # and whenever an async builtin needs a coroutine awaited on the loop.
+    # As the loop and the run never execute at the same time, nothing they
+    # share needs locking.
+    def __init__(self, yield_every=ASYNC_YIELD_STEPS):
+        self.yield_every = yield_every
+        self.steps = 0
+        self.resumed = threading.Event()
+        self.paused = threading.Event()
+        self.request = None      # awaitable the run wants the loop to await
+        self.reply = None        # (value, exception) from awaiting it
+        self.cancelled = False
+        self.done = False
+        self.result = None
+        self.exception = None
+        self.wrappings = None
+        self.runtime = None
+
+    async def run(self, function):
+        # function() is called on the helper thread; its result is returned
+        thread = threading.Thread(target=self.main, args=(function,), name='boring-run', daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                self.resume()
+                if self.done: break
+
+                request, self.request = self.request, None
+                if request is None:
+                    await asyncio.sleep(0)
+                    continue
+                try:
+                    self.reply = (await request, None)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exception:
+                    self.reply = (None, exception)
+        except asyncio.CancelledError:
+            # let the run unwind, so its limits and instruments detach
+            self.cancelled = True
+            if not self.done:
+                self.resume()
+            raise
+        finally:
+            thread.join()
+
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+    def resume(self):
+        # lets the run go on and blocks the loop until it pauses or ends
+        self.paused.clear()
+        self.resumed.set()
+        self.paused.wait()
+
+    def main(self, function):
+        self.resumed.wait()
+        self.resumed.clear()
+        try:
+            self.result = function()
+        except RunCancelled:
+            pass
+        except BaseException as exception:
+            self.exception = exception
+        finally:
+            self.done = True
+            self.paused.set()
+
+    def pause(self, request=None):
+        # called on the run's thread; returns once the loop resumes the run
+        self.request = request
+        self.paused.set()
+        self.resumed.wait()
+        self.resumed.clear()
+        if self.cancelled:
+            raise RunCancelled()
+
+        reply, self.reply = self.reply, None
+        return reply
+
+    def wait_for(self, awaitable):
+        # (value, exception) of awaiting awaitable on the event loop
+        return self.pause(awaitable)
+
+    ####
+
+    def attach(self, runtime):
+        self.runtime = runtime
+        runtime.driver = self
+        self.wrappings = [
+            runtime.wrap('visit_body', self.wrap_step),
+            runtime.wrap('visit_loop_body', self.wrap_step)
+        ]
+        return self
+
+    def detach(self):
+        if self.runtime is None: return
+
+        for wrapping in reversed(self.wrappings):
+            self.runtime.unwrap(wrapping)
+        self.runtime.driver = None
+        self.runtime = None
+        self.wrappings = None
+
+    def wrap_step(self, visit):
+        def yielding_visit(node, context):
+            self.steps += 1
+            if self.steps >= self.yield_every:
+                self.steps = 0
+                self.pause()
+            return visit(node, context)
+        return yielding_visit
\ No newline at end of file
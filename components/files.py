@@ -0,0 +1,107 @@
+import os
+import mmap
+from bits.constants import MMAP_THRESHOLD, WRITE_CHUNK_SIZE
+
+### MAPPED FILES
+
+class MappedFile:
+    # The memory mapping of a file read by read_file(), decoded into a
+    # Python string the first time the program uses its text. The mapping
+    # is released once decoded.
+    def __init__(self, mapping, path):
+        self.mapping = mapping
+        self.path = path
+        self.decoded = None
+
+    def text(self):
+        if self.decoded is None:
+            self.decoded = str(self.mapping, 'utf-8', 'replace')
+            self.mapping.close()
+            self.mapping = None
+        return self.decoded
+
+### FILE ACCESS
+
+class FileAccess:
+    # How one runtime's file builtins reach the file system, and the hooks
+    # a host uses to restrict them:
+    #   root      paths are taken relative to this directory and may not
+    #             leave it, symlinks included
+    #   writable  False makes write_file() and append_file() fail
+    #   check     check(path, mode) is called before every open, with mode
+    #             'r', 'w' or 'a'; it returns the path to open instead, or
+    #             raises PermissionError to refuse
+    #
+    # append_file() keeps its file open and buffered until the run ends, or
+    # until the same file is read or written another way, so appending a
+    # line at a time does not reopen it every time.
+    def __init__(self, root=None, writable=True, check=None):
+        self.root = os.path.realpath(root) if root is not None else None
+        self.writable = writable
+        self.check = check
+        self.appending = {}
+
+    def resolve(self, path, mode):
+        # the real path to open; PermissionError if the program may not
+        if self.check is not None:
+            path = self.check(path, mode)
+        if mode != 'r' and not self.writable:
+            raise PermissionError(f"'{path}' cannot be written here")
+        if self.root is None:
+            return path
+
+        real = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([real, self.root]) != self.root:
+            raise PermissionError(f"'{path}' is outside of {self.root}")
+        return real
+
+    def read(self, path):
+        # the text of a file, or a MappedFile for a large one
+        real = self.resolve(path, 'r')
+        self.finish(real)
+        with open(real, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+                return f.read().decode('utf-8', 'replace')
+            return MappedFile(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), real)
+
+    def open_text(self, path):
+        # a file opened for reading its text bit by bit
+        real = self.resolve(path, 'r')
+        self.finish(real)
+        return open(real, encoding='utf-8', errors='replace', newline='')
+
+    def write(self, path, text):
+        real = self.resolve(path, 'w')
+        self.finish(real)
+        with open(real, 'w', encoding='utf-8', newline='') as f:
+            write_chunked(f, text)
+
+    def append(self, path, text):
+        real = self.resolve(path, 'a')
+        f = self.appending.get(real)
+        if f is None:
+            f = self.appending[real] = open(real, 'a', encoding='utf-8', newline='')
+        write_chunked(f, text)
+
+    def finish(self, real):
+        # closes the append handle of a file about to be opened another way
+        f = self.appending.pop(real, None)
+        if f is not None: f.close()
+
+    def close(self):
+        # closes the files appended to once the run ends; the first error
+        # closing one, or None
+        handles = list(self.appending.values())
+        self.appending = {}
+        error = None
+        for f in handles:
+            try:
+                f.close()
+            except OSError as exception:
+                error = error or exception
+        return error
+
+def write_chunked(f, text):
+    # a huge string is never encoded all at once
+    for start in range(0, len(text), WRITE_CHUNK_SIZE):
+        f.write(text[start:start + WRITE_CHUNK_SIZE])
\ No newline at end of file
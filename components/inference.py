@@ -0,0 +1,266 @@
+from values.types import Number, String
+from components.quickening import BinOpSite
+from bits.nodes import iter_nodes
+from bits.constants import *
+
+### TYPES
+
+T_NUMBER = "number"
+T_STRING = "string"
+T_LIST = "list"
+T_MAP = "map"
+T_RANGE = "range"
+T_FUNCTION = "function"
+
+VALUE_CLASSES = {
+    T_NUMBER : Number,
+    T_STRING : String
+}
+
+# result type of a binary operation for each proven pair of operand types
+BINARY_RESULTS = {
+    (T_NUMBER, T_NUMBER) : lambda key: T_NUMBER,
+    (T_STRING, T_STRING) : lambda key: T_STRING if key == T_PLUS else T_NUMBER if key == T_EE else None,
+    (T_STRING, T_NUMBER) : lambda key: T_STRING if key == T_MUL else None,
+    (T_LIST, T_NUMBER) : lambda key: T_LIST if key in (T_PLUS, T_MUL) else None
+}
+
+# type of the loop variable in 'for x in ...' for each proven iterable type
+ELEMENT_TYPES = {
+    T_STRING : T_STRING,
+    T_RANGE : T_NUMBER
+}
+
+LOOP_MAX_PASSES = 3
+
+def join(types):
+    first = types[0]
+    for type_ in types:
+        if type_ != first: return None
+    return first
+
+def join_envs(envs):
+    first = envs[0]
+    return {
+        name: type_ for name, type_ in first.items()
+        if type_ is not None and all(env.get(name) == type_ for env in envs)
+    }
+
+### TYPE INFERRER
+
+class TypeInferrer:
+    # A flow-sensitive pass over the tree before it runs. It follows every
+    # 'var' assignment in evaluation order, keeping one environment per
+    # scope, and records the type of each expression it can prove. A name
+    # that is unset, set differently on two paths, or read from an outer
+    # scope is unknown, because only code in the same scope can rebind it.
+    #
+    # Binary operations whose operand types are proven get a BinOpSite with
+    # the specialised handler installed up front, which the interpreter then
+    # calls without a guard.
+    def __init__(self):
+        self.types = {}
+
+    def infer(self, node):
+        self.visit(node, {})
+        return self
+
+    def visit(self, node, env):
+        method_name = f'visit_{type(node).__name__}'
+        method = getattr(self, method_name, self.visit_children)
+        type_ = method(node, env)
+
+        if type_ is None:
+            self.types.pop(node, None)
+        else:
+            self.types[node] = type_
+        return type_
+
+    def visit_children(self, node, env):
+        for child in node.children():
+            self.visit(child, env)
+
+        # an unknown node may rebind anything in this scope
+        env.clear()
+        return None
+
+    ####
+
+    def visit_NumberNode(self, node, env):
+        return T_NUMBER
+
+    def visit_StringNode(self, node, env):
+        return T_STRING
+
+    def visit_ListNode(self, node, env):
+        for element_node in node.element_nodes:
+            self.visit(element_node, env)
+        return T_LIST
+
+    def visit_MapNode(self, node, env):
+        for key_node, value_node in node.entry_nodes:
+            self.visit(key_node, env)
+            self.visit(value_node, env)
+        return T_MAP
+
+    def visit_VarAccessNode(self, node, env):
+        return env.get(node.var_name_tok.value)
+
+    def visit_VarAssignNode(self, node, env):
+        type_ = self.visit(node.value_node, env)
+        env[node.var_name_tok.value] = type_
+        return type_
+
+    def visit_BinOpNode(self, node, env):
+        left = self.visit(node.left, env)
+        right = self.visit(node.right, env)
+
+        # a site from an earlier pass over a loop body may no longer hold
+        node.site = BinOpSite(node.op_tok)
+        if left in VALUE_CLASSES and right in VALUE_CLASSES:
+            node.site.prove(VALUE_CLASSES[left], VALUE_CLASSES[right])
+
+        result = BINARY_RESULTS.get((left, right))
+        return result(node.op_tok.type) if result else None
+
+    def visit_UnaryOpNode(self, node, env):
+        type_ = self.visit(node.node, env)
+        if node.op_tok.matches(T_KEYWORD, 'not'):
+            return T_NUMBER
+        return T_NUMBER if type_ == T_NUMBER else None
+
+    def visit_IfNode(self, node, env):
+        branch_envs = []
+        branch_types = []
+        condition_env = dict(env)
+
+        for condition, expr, should_return_null in node.cases:
+            self.visit(condition, condition_env)
+            branch_env = dict(condition_env)
+            type_ = self.visit(expr, branch_env)
+            branch_envs.append(branch_env)
+            branch_types.append(T_NUMBER if should_return_null else type_)
+
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            branch_env = dict(condition_env)
+            type_ = self.visit(expr, branch_env)
+            branch_envs.append(branch_env)
+            branch_types.append(T_NUMBER if should_return_null else type_)
+        else:
+            branch_envs.append(condition_env)
+            branch_types.append(T_NUMBER)
+
+        env.clear()
+        env.update(join_envs(branch_envs))
+        return join(branch_types)
+
+    def visit_ForNode(self, node, env):
+        self.visit(node.start_value_node, env)
+        self.visit(node.end_value_node, env)
+        if node.step_value_node:
+            self.visit(node.step_value_node, env)
+
+        var_name = node.var_name_tok.value
+        self.visit_loop(env, None, node.body_node, {var_name: T_NUMBER})
+        return T_NUMBER if node.should_return_null else T_LIST
+
+    def visit_ForInNode(self, node, env):
+        iterable = self.visit(node.iterable_node, env)
+
+        var_name = node.var_name_tok.value
+        self.visit_loop(env, None, node.body_node, {var_name: ELEMENT_TYPES.get(iterable)})
+        return T_NUMBER if node.should_return_null else T_LIST
+
+    def visit_WhileNode(self, node, env):
+        self.visit_loop(env, node.condition_node, node.body_node, {})
+        return T_NUMBER if node.should_return_null else T_LIST
+
+    def visit_loop(self, env, condition_node, body_node, bindings):
+        # iterate to a fixed point: the environment at the top of the loop is
+        # whatever holds both on entry and after any number of iterations
+        entry = dict(env)
+
+        for passes in range(LOOP_MAX_PASSES):
+            if passes == LOOP_MAX_PASSES - 1:
+                entry = {}
+
+            condition_env = dict(entry)
+            if condition_node:
+                self.visit(condition_node, condition_env)
+
+            body_env = dict(condition_env)
+            body_env.update(bindings)
+            self.visit(body_node, body_env)
+
+            merged = join_envs([entry, body_env])
+            if merged == entry: break
+            entry = merged
+
+        env.clear()
+        env.update(condition_env if condition_node else join_envs([entry, body_env]))
+
+    def visit_FuncDefNode(self, node, env):
+        # the body runs later in its own scope, where only its own
+        # assignments are known
+        self.visit(node.body_node, {})
+
+        if node.var_name_tok:
+            env[node.var_name_tok.value] = T_FUNCTION
+        return T_FUNCTION
+
+    def visit_CallNode(self, node, env):
+        self.visit(node.node_to_call, env)
+        for arg_node in node.arg_nodes:
+            self.visit(arg_node, env)
+        return None
+
+    def visit_IndexNode(self, node, env):
+        self.visit(node.node, env)
+        self.visit(node.index_node, env)
+        return None
+
+    def visit_SliceNode(self, node, env):
+        type_ = self.visit(node.node, env)
+        if node.start_node:
+            self.visit(node.start_node, env)
+        if node.end_node:
+            self.visit(node.end_node, env)
+        return type_ if type_ in (T_STRING, T_LIST, T_RANGE) else None
+
+    def visit_IndexAssignNode(self, node, env):
+        self.visit(node.index_node.node, env)
+        self.visit(node.index_node.index_node, env)
+        return self.visit(node.value_node, env)
+
+### EXPLAIN
+
+def describe(node):
+    name = type(node).__name__
+    if hasattr(node, 'var_name_tok') and node.var_name_tok:
+        return f"{name} '{node.var_name_tok.value}'"
+    if hasattr(node, 'op_tok'):
+        return f"{name} {node.op_tok}"
+    if hasattr(node, 'tok'):
+        return f"{name} {node.tok}"
+    return name
+
+def explain_types(tree):
+    inferrer = TypeInferrer().infer(tree)
+    lines = []
+
+    for node in iter_nodes(tree):
+        type_ = inferrer.types.get(node)
+        if type_ is None: continue
+
+        note = ''
+        site = getattr(node, 'site', None)
+        if site is not None and site.proven:
+            note = '  (unchecked fast path)'
+        lines.append((
+            node.pos_start.ln, node.pos_start.col,
+            f"{node.pos_start.ln + 1}:{node.pos_start.col}  {describe(node)}: {type_}{note}"
+        ))
+
+    lines.sort(key=lambda line: (line[0], line[1]))
+    return "\n".join(line[2] for line in lines)
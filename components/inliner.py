@@ -0,0 +1,111 @@
+from bits.nodes import *
+from bits.misc import Context, SymbolTable
+from bits.constants import INLINE_MAX_NODES
+
+# node kinds an inlined body may contain; anything that calls, loops, defines
+# functions or binds names keeps the function out of line
+INLINABLE_NODES = (
+    NumberNode, StringNode, ListNode, MapNode, VarAccessNode, BinOpNode,
+    UnaryOpNode, IfNode, IndexNode, SliceNode, IndexAssignNode
+)
+
+### INLINE SITE
+
+class InlineSite:
+    # Attached to a CallNode whose callee's body is evaluated right at the
+    # call site. The body has no calls of its own, so it can never be
+    # re-entered while running and one frame per site is reused for every
+    # call. The frame keeps the function's name as its display_name, so
+    # tracebacks look the same as for an ordinary call.
+    __slots__ = ('name', 'arg_names', 'body_node', 'frame')
+
+    def __init__(self, name, arg_names, body_node):
+        self.name = name
+        self.arg_names = arg_names
+        self.body_node = body_node
+        self.frame = None
+
+    def get_frame(self, context, pos_start):
+        # the frame for a call from context at pos_start, entered from there
+        # like Function.execute enters a new context for an ordinary call
+        frame = self.frame
+        if frame is None:
+            frame = self.frame = Context(self.name)
+            frame.symbol_table = SymbolTable()
+
+        frame.parent = context
+        frame.parent_entry_pos = pos_start
+        frame.symbol_table.parent = context.symbol_table
+        return frame
+
+### INLINER
+
+def count_bindings(tree):
+    bindings = {}
+    for node in iter_nodes(tree):
+        names = []
+        if isinstance(node, (VarAssignNode, ForNode, ForInNode)):
+            names.append(node.var_name_tok.value)
+        elif isinstance(node, FuncDefNode):
+            if node.var_name_tok:
+                names.append(node.var_name_tok.value)
+            names.extend(arg_name.value for arg_name in node.arg_name_toks)
+
+        for name in names:
+            bindings[name] = bindings.get(name, 0) + 1
+    return bindings
+
+class Inliner:
+    # Substitutes small functions into their call sites. A function is
+    # inlined when it is defined by a top-level 'fn name(...) -> expr'
+    # statement, its name is bound nowhere else in the program, and its body
+    # is at most INLINE_MAX_NODES nodes of INLINABLE_NODES. Only calls in
+    # later top-level statements with the right number of arguments are
+    # inlined, so the function always exists by the time they run.
+    def __init__(self, max_nodes=INLINE_MAX_NODES):
+        self.max_nodes = max_nodes
+
+    def inline(self, tree):
+        if not isinstance(tree, ListNode): return 0
+
+        bindings = count_bindings(tree)
+        candidates = {}
+        inlined = 0
+
+        for index, statement in enumerate(tree.element_nodes):
+            if index > 0:
+                inlined += self.inline_calls(statement, candidates)
+            if self.is_inlinable(statement, bindings):
+                candidates[statement.var_name_tok.value] = statement
+
+        return inlined
+
+    def is_inlinable(self, node, bindings):
+        if not isinstance(node, FuncDefNode) or not node.var_name_tok: return False
+        if node.should_return_null: return False
+        if bindings.get(node.var_name_tok.value) != 1: return False
+
+        size = 0
+        for body_node in iter_nodes(node.body_node):
+            if not isinstance(body_node, INLINABLE_NODES): return False
+            size += 1
+            if size > self.max_nodes: return False
+        return True
+
+    def inline_calls(self, statement, candidates):
+        inlined = 0
+        if not candidates: return inlined
+
+        for node in iter_nodes(statement):
+            if not isinstance(node, CallNode) or not isinstance(node.node_to_call, VarAccessNode): continue
+
+            func_def = candidates.get(node.node_to_call.var_name_tok.value)
+            if func_def is None or len(func_def.arg_name_toks) != len(node.arg_nodes): continue
+
+            node.inline = InlineSite(
+                func_def.var_name_tok.value,
+                [arg_name.value for arg_name in func_def.arg_name_toks],
+                func_def.body_node
+            )
+            inlined += 1
+        return inlined
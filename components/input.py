@@ -0,0 +1,106 @@
+import sys
+import codecs
+from bits.constants import INPUT_CHUNK_SIZE
+
+### INPUT
+
+class InputSource:
+    # The text of an input stream, read INPUT_CHUNK_SIZE bytes at a time and
+    # handed out a line, a list of numbers or all of it at a time. Every
+    # reading builtin takes from the same buffer, so they can be mixed.
+    #
+    # The stream is sys.stdin as it is at the time of reading unless one is
+    # given. A terminal is read a line at a time, so a program can prompt
+    # for each line; any other stream is read as soon as data is available,
+    # without waiting for a whole chunk.
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.text = ''
+        self.pos = 0
+        self.ended = False
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def refill(self):
+        # reads more text after what is left in the buffer; False at the end
+        if self.ended: return False
+
+        stream = self.stream or sys.stdin
+        binary = getattr(stream, 'buffer', None)
+        if stream.isatty():
+            chunk = stream.readline()
+        elif hasattr(binary, 'read1'):
+            data = binary.read1(INPUT_CHUNK_SIZE)
+            chunk = self.decoder.decode(data, final=not data)
+        else:
+            chunk = stream.read(INPUT_CHUNK_SIZE)
+
+        if not chunk:
+            self.ended = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def take(self):
+        # the unread text in the buffer, which is left empty
+        text = self.text[self.pos:]
+        self.text = ''
+        self.pos = 0
+        return text
+
+    def buffered_line(self):
+        # the next line if all of it has been read already, else None
+        end = self.text.find('\n', self.pos)
+        if end < 0: return None
+
+        line = self.text[self.pos:end]
+        self.pos = end + 1
+        return line[:-1] if line.endswith('\r') else line
+
+    def read_line(self):
+        # the next line without its line break, or None at the end
+        while True:
+            line = self.buffered_line()
+            if line is not None: return line
+
+            if not self.refill():
+                line = self.take()
+                return line if line else None
+
+    def read_all(self):
+        parts = [self.take()]
+        while self.refill():
+            parts.append(self.take())
+        return ''.join(parts)
+
+    def read_ints(self):
+        # every whole number in the rest of the input, separated by
+        # whitespace; ValueError naming the first word that is not one
+        numbers = []
+        carry = ''
+        while True:
+            more = self.refill()
+            text = carry + self.take()
+            words = text.split()
+            carry = ''
+            # the last word may go on in the next chunk
+            if more and words and not text[-1].isspace():
+                carry = words.pop()
+
+            try:
+                numbers.extend(map(int, words))
+            except ValueError:
+                for word in words:
+                    if not is_int(word):
+                        raise ValueError(f"'{word}' is not a whole number")
+            if not more: return numbers
+
+def is_int(word):
+    try:
+        int(word)
+    except ValueError:
+        return False
+    return True
+
+# the input every runtime reads unless it is given another
+stdin = InputSource()
\ No newline at end of file
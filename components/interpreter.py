@@ -1,7 +1,9 @@
-from values.types import Number, String, List, Function
+from values.types import Number, String, List, Map, Function, Task, current_scheduler
+from values.base import BaseFunction, IterationFailed, current_quota
 from bits.constants import *
 from bits.results import RTResult
 from bits.error import *
+from components.quickening import BinOpSite
 
 ### INTERPRETER
 
@@ -13,31 +15,112 @@ class Interpreter:
     
     def no_visit_method(self, node, context):
         raise Exception(f'No visit_{type(node).__name__} method defined')
+
+    def visit_body(self, node, context):
+        # every function call evaluates its body through here, in its new frame
+        return self.visit(node, context)
+
+    def visit_loop_body(self, node, context):
+        # every iteration of a loop evaluates its body through here
+        return self.visit(node, context)
     
     ####
 
     def visit_NumberNode(self, node, context):
-        return RTResult().success(
-            Number(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        # each node builds its value once, frozen, so every evaluation gets a
+        # copy with its own context
+        value = node.value
+        if value is None:
+            value = node.value = Number(node.tok.value).set_pos(node.pos_start, node.pos_end).freeze()
+        return RTResult().success(value.set_context(context))
     
     def visit_StringNode(self, node, context):
-        return RTResult().success(
-            String(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        value = node.value
+        if value is None:
+            value = node.value = String(node.tok.value).set_pos(node.pos_start, node.pos_end)
+        return RTResult().success(value.copy().set_context(context))
     
     def visit_ListNode(self, node, context):
         res = RTResult()
         elements = []
+        # a body of statements is a list too, so a statement that went over
+        # the memory limit is reported as soon as it is done
+        quota = current_quota()
 
         for element_node in node.element_nodes:
             elements.append(res.register(self.visit(element_node, context)))
             if res.error: return res
+            if quota is not None and quota.exceeded:
+                return res.failure(quota.error(element_node.pos_start, element_node.pos_end, context))
         
         return res.success(
             List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
         )
     
+    def visit_MapNode(self, node, context):
+        res = RTResult()
+        entries = {}
+
+        for key_node, value_node in node.entry_nodes:
+            key = res.register(self.visit(key_node, context))
+            if res.error: return res
+
+            if not Map.is_valid_key(key):
+                return res.failure(RuntimeError(
+                    key_node.pos_start, key_node.pos_end,
+                    "Map keys must be numbers or strings", context
+                ))
+
+            value = res.register(self.visit(value_node, context))
+            if res.error: return res
+            entries[key.value] = value
+        
+        return res.success(
+            Map(entries).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+    
+    def visit_IndexNode(self, node, context):
+        res = RTResult()
+        value = res.register(self.visit(node.node, context))
+        if res.error: return res
+        index = res.register(self.visit(node.index_node, context))
+        if res.error: return res
+
+        element, error = value.get_index(index)
+        if error: return res.failure(error)
+        return res.success(element.copy().set_pos(node.pos_start, node.pos_end).set_context(context))
+
+    def visit_SliceNode(self, node, context):
+        res = RTResult()
+        value = res.register(self.visit(node.node, context))
+        if res.error: return res
+
+        start = end = None
+        if node.start_node:
+            start = res.register(self.visit(node.start_node, context))
+            if res.error: return res
+        if node.end_node:
+            end = res.register(self.visit(node.end_node, context))
+            if res.error: return res
+
+        result, error = value.get_slice(start, end)
+        if error: return res.failure(error)
+        return res.success(result.set_pos(node.pos_start, node.pos_end))
+
+    def visit_IndexAssignNode(self, node, context):
+        res = RTResult()
+        target = node.index_node
+        value = res.register(self.visit(target.node, context))
+        if res.error: return res
+        index = res.register(self.visit(target.index_node, context))
+        if res.error: return res
+        new_value = res.register(self.visit(node.value_node, context))
+        if res.error: return res
+
+        error = value.set_index(index, new_value)
+        if error: return res.failure(error)
+        return res.success(new_value)
+
     def visit_VarAccessNode(self, node, context):
         res = RTResult()
         var_name = node.var_name_tok.value
@@ -67,39 +150,17 @@ class Interpreter:
         right = res.register(self.visit(node.right, context))
         if res.error: return res
 
-        error = None
-        if node.op_tok.type == T_PLUS:
-            result, error = left.added_to(right)
-        elif node.op_tok.type == T_MINUS:
-            result, error = left.subtracted_by(right)
-        elif node.op_tok.type == T_MUL:
-            result, error = left.mul_by(right)
-        elif node.op_tok.type == T_MOD:
-            result, error = left.mod_by(right)
-        elif node.op_tok.type == T_DIV:
-            result, error = left.div_by(right)
-        elif node.op_tok.type == T_FLOORDIV:
-            result, error = left.floor_div_by(right)
-        elif node.op_tok.type == T_POW:
-            result, error = left.to_pow_of(right)
-        elif node.op_tok.type == T_EE:
-            result, error = left.get_comparison_equals(right)
-        elif node.op_tok.type == T_NE:
-            result, error = left.get_comparison_notequals(right)
-        elif node.op_tok.type == T_LE:
-            result, error = left.get_comparison_lessthan(right)
-        elif node.op_tok.type == T_GE:
-            result, error = left.get_comparison_greaterthan(right)
-        elif node.op_tok.type == T_LTE:
-            result, error = left.get_comparison_lessthanequals(right)
-        elif node.op_tok.type == T_GTE:
-            result, error = left.get_comparison_greaterthanequals(right)
-        elif node.op_tok.matches(T_KEYWORD, 'and'):
-            result, error = left.and_with(right)
-        elif node.op_tok.matches(T_KEYWORD, 'or'):
-            result, error = left.or_with(right)
+        site = node.site
+        if site is None:
+            site = node.site = BinOpSite(node.op_tok)
 
+        handler = site.handler
+        if handler is not None and (site.proven or type(left) is site.left_type and type(right) is site.right_type):
+            result = handler(left, right)
+            if result is not None:
+                return res.success(result.set_pos(node.pos_start, node.pos_end))
 
+        result, error = site.run(left, right)
         if error:
             return res.failure(error)
         else:
@@ -112,7 +173,7 @@ class Interpreter:
 
         error = None
         if node.op_tok.type == T_MINUS:
-            number, error = number.mul_by(Number(-1))
+            number, error = number.mul_by(Number.of(-1))
         if node.op_tok.matches(T_KEYWORD, "not"):
             number, error = number.notted()
 
@@ -155,7 +216,7 @@ class Interpreter:
             step_value = res.register(self.visit(node.step_value_node, context))
             if res.error: return res
         else:
-            step_value = Number(1)
+            step_value = Number.of(1)
         
         i = start_value.value
         if step_value.value >= 0:
@@ -163,21 +224,60 @@ class Interpreter:
         else:
             condition = lambda: i > end_value.value
 
+        symbols = context.symbol_table.symbols
+        var_name = node.var_name_tok.value
+        quota = current_quota()
+
         while condition():
-            context.symbol_table.set(node.var_name_tok.value, Number(i))
+            symbols[var_name] = Number.of(i)
             i += step_value.value
 
-            elements.append(res.register(self.visit(node.body_node, context)))
+            value = res.register(self.visit_loop_body(node.body_node, context))
             if res.error: return res
+            error = self.collect(node, elements, value, quota, context)
+            if error: return res.failure(error)
         
         return res.success(
             Number.null if node.should_return_null else 
-            List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+            List(elements, shared=True).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+
+    def visit_ForInNode(self, node, context):
+        res = RTResult()
+        elements = []
+
+        iterable = res.register(self.visit(node.iterable_node, context))
+        if res.error: return res
+
+        iterator, error = iterable.iterate()
+        if error: return res.failure(error)
+
+        # the loop variable is rebound straight in the scope's dict
+        symbols = context.symbol_table.symbols
+        var_name = node.var_name_tok.value
+        body_node = node.body_node
+        quota = current_quota()
+
+        try:
+            for value in iterator:
+                symbols[var_name] = value
+
+                value = res.register(self.visit_loop_body(body_node, context))
+                if res.error: return res
+                error = self.collect(node, elements, value, quota, context)
+                if error: return res.failure(error)
+        except IterationFailed as failed:
+            return res.failure(failed.error)
+
+        return res.success(
+            Number.null if node.should_return_null else
+            List(elements, shared=True).set_context(context).set_pos(node.pos_start, node.pos_end)
         )
     
     def visit_WhileNode(self, node, context):
         res = RTResult()
         elements = []
+        quota = current_quota()
 
         while True:
             condition = res.register(self.visit(node.condition_node, context))
@@ -185,13 +285,26 @@ class Interpreter:
 
             if not condition.is_true(): break
 
-            elements.append(res.register(self.visit(node.body_node, context)))
+            value = res.register(self.visit_loop_body(node.body_node, context))
             if res.error: return res
+            error = self.collect(node, elements, value, quota, context)
+            if error: return res.failure(error)
 
         return res.success(
             Number.null if node.should_return_null else
-            List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+            List(elements, shared=True).set_context(context).set_pos(node.pos_start, node.pos_end)
         )
+
+    def collect(self, node, elements, value, quota, context):
+        # adds the value of one iteration to the list a loop returns, charging
+        # it to the memory quota as it goes; a loop written as a block returns
+        # null, so it keeps nothing
+        if node.should_return_null: return None
+
+        elements.append(value)
+        if quota is not None and quota.charge(LIST_ELEMENT_BYTES):
+            return quota.error(node.pos_start, node.pos_end, context)
+        return None
     
     def visit_FuncDefNode(self, node, context):
         res = RTResult()
@@ -207,6 +320,36 @@ class Interpreter:
         return res.success(func_value)
     
     def visit_CallNode(self, node, context):
+        if node.inline is not None:
+            return self.visit_inlined_call(node, context)
+        return self.call(node, context)
+
+    def visit_inlined_call(self, node, context):
+        res = RTResult()
+        site = node.inline
+
+        # the name may have been rebound since it was inlined, e.g. by an
+        # earlier program run in the same shell
+        function = context.symbol_table.get(site.name)
+        if not isinstance(function, Function) or function.body_node is not site.body_node:
+            return self.call(node, context)
+
+        args = []
+        for arg_node in node.arg_nodes:
+            args.append(res.register(self.visit(arg_node, context)))
+            if res.error: return res
+
+        frame = site.get_frame(context, node.pos_start)
+        symbols = frame.symbol_table.symbols
+        for arg_name, arg_value in zip(site.arg_names, args):
+            symbols[arg_name] = arg_value.set_context(frame)
+
+        return_value = res.register(self.visit_body(site.body_node, frame))
+        if res.error: return res
+        return_value = return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+        return res.success(return_value)
+
+    def call(self, node, context):
         res = RTResult()
         args = []
 
@@ -219,7 +362,52 @@ class Interpreter:
             args.append(res.register(self.visit(arg_node, context)))
             if res.error: return res
         
-        return_value = res.register(value_to_call.execute(args))
+        try:
+            return_value = res.register(value_to_call.execute(args))
+        except RecursionError:
+            # Python's stack ran out, in this call or one nested in it; the
+            # innermost call with room left to build the error reports it
+            return res.failure(RuntimeError(
+                node.pos_start, node.pos_end,
+                "Maximum recursion depth exceeded", context
+            ))
         if res.error: return res
         return_value = return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
-        return res.success(return_value)
\ No newline at end of file
+        return res.success(return_value)
+
+    def visit_SpawnNode(self, node, context):
+        res = RTResult()
+        call_node = node.call_node
+        args = []
+
+        value_to_call = res.register(self.visit(call_node.node_to_call, context))
+        if res.error: return res
+
+        if not isinstance(value_to_call, BaseFunction):
+            return res.failure(RuntimeError(
+                call_node.node_to_call.pos_start, call_node.node_to_call.pos_end,
+                "Only functions can be spawned", context
+            ))
+        value_to_call = value_to_call.copy().set_pos(call_node.pos_start, call_node.pos_end)
+
+        for arg_node in call_node.arg_nodes:
+            args.append(res.register(self.visit(arg_node, context)))
+            if res.error: return res
+
+        task = current_scheduler().spawn(value_to_call, args)
+        return res.success(Task(task).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+    def visit_AwaitNode(self, node, context):
+        res = RTResult()
+        task = res.register(self.visit(node.node, context))
+        if res.error: return res
+
+        if not isinstance(task, Task):
+            return res.failure(RuntimeError(
+                node.node.pos_start, node.node.pos_end,
+                "Only tasks can be awaited", context
+            ))
+
+        value, error = task.join()
+        if error: return res.failure(error)
+        return res.success(value.copy().set_pos(node.pos_start, node.pos_end).set_context(context))
\ No newline at end of file
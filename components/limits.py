@@ -0,0 +1,110 @@
+import time
+from bits.results import RTResult
+from bits.error import RuntimeError
+from bits.constants import DEADLINE_CHECK_STEPS
+from values.base import AllocationQuota
+
+### LIMITS
+
+class Limits:
+    # Resource limits for one run. A step is one function call, one loop
+    # iteration or one element a builtin such as sum or map goes through,
+    # the only places a program can keep running for long. Calls and loops
+    # are checked by wrapping the runtime's visit_body and visit_loop_body,
+    # and builtins check through runtime.limits, every BUILTIN_CHECK_ELEMENTS
+    # elements; straight-line code between them is bounded by the length of
+    # the program. The clock is read every DEADLINE_CHECK_STEPS steps. The
+    # memory limit is an AllocationQuota on the bytes of list elements and
+    # string characters created during the run; see there for where it is
+    # checked.
+    #
+    # Going over a limit fails the call, iteration or builtin with a
+    # RuntimeError, which unwinds the program with a traceback like any
+    # other error. Deep recursion overflows Python's own stack at a few
+    # hundred nested calls, which fails as "Maximum recursion depth
+    # exceeded", so max_depth should stay below that.
+    def __init__(self, max_steps=None, timeout=None, max_depth=None, max_memory=None, clock=time.monotonic):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.max_memory = max_memory
+        self.clock = clock
+
+        self.steps = 0
+        self.depth = 0
+        self.deadline = None
+        self.quota = None
+        self.quota_token = None
+        self.wrappings = None
+        self.runtime = None
+
+    def copy(self):
+        # the same limits for another run
+        return Limits(self.max_steps, self.timeout, self.max_depth, self.max_memory, self.clock)
+
+    def attach(self, runtime):
+        self.steps = 0
+        self.depth = 0
+        if self.timeout is not None:
+            self.deadline = self.clock() + self.timeout
+        if self.max_memory is not None:
+            self.quota = AllocationQuota(self.max_memory)
+            self.quota_token = self.quota.activate()
+
+        self.runtime = runtime
+        runtime.limits = self
+        self.wrappings = [
+            runtime.wrap('visit_body', self.wrap_visit_body),
+            runtime.wrap('visit_loop_body', self.wrap_visit_loop_body)
+        ]
+        return self
+
+    def detach(self):
+        if self.runtime is None: return
+
+        for wrapping in reversed(self.wrappings):
+            self.runtime.unwrap(wrapping)
+        if self.quota is not None:
+            self.quota.deactivate(self.quota_token)
+            self.quota_token = None
+        self.runtime.limits = None
+        self.runtime = None
+        self.wrappings = None
+
+    def check(self, steps=1):
+        # what was exceeded by taking this many more steps, or None; the
+        # clock is always read for more than one step at a time
+        self.steps += steps
+        if self.max_steps is not None and self.steps > self.max_steps:
+            return f"Step limit of {self.max_steps} exceeded"
+        if self.deadline is not None and (steps > 1 or self.steps % DEADLINE_CHECK_STEPS == 0) and self.clock() > self.deadline:
+            return f"Time limit of {self.timeout}s exceeded"
+        return self.check_memory()
+
+    def check_memory(self):
+        # what was exceeded by the values created so far, or None
+        if self.quota is not None and self.quota.exceeded:
+            return f"Memory limit of {self.max_memory} bytes exceeded"
+        return None
+
+    def wrap_visit_body(self, visit_body):
+        def limited_visit_body(node, context):
+            self.depth += 1
+            try:
+                info = self.check()
+                if info is None and self.max_depth is not None and self.depth > self.max_depth:
+                    info = f"Call depth limit of {self.max_depth} exceeded"
+                if info is not None:
+                    return RTResult().failure(RuntimeError(node.pos_start, node.pos_end, info, context))
+                return visit_body(node, context)
+            finally:
+                self.depth -= 1
+        return limited_visit_body
+
+    def wrap_visit_loop_body(self, visit_loop_body):
+        def limited_visit_loop_body(node, context):
+            info = self.check()
+            if info is not None:
+                return RTResult().failure(RuntimeError(node.pos_start, node.pos_end, info, context))
+            return visit_loop_body(node, context)
+        return limited_visit_loop_body
\ No newline at end of file
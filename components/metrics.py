@@ -0,0 +1,131 @@
+import time
+from bits.nodes import iter_nodes
+from components.runtime import allocations, lookups
+
+# name, prometheus type and help text of every metric, in report order;
+# what adds up over runs is a counter, written with a _total suffix
+METRICS = [
+    ('lex_seconds', 'counter', "Time spent turning source into tokens"),
+    ('parse_seconds', 'counter', "Time spent building the syntax tree"),
+    ('analyse_seconds', 'counter', "Time spent inlining and inferring types"),
+    ('execute_seconds', 'counter', "Time spent running the program"),
+    ('tokens', 'counter', "Tokens produced by the lexer"),
+    ('nodes', 'counter', "Nodes in the syntax tree"),
+    ('node_visits', 'counter', "Nodes evaluated by the interpreter"),
+    ('function_calls', 'counter', "Calls of BoringLang functions"),
+    ('values_allocated', 'counter', "Number, string, list, map and range values created"),
+    ('symbol_lookups', 'counter', "Symbol tables searched for a name"),
+    ('peak_context_depth', 'gauge', "Deepest chain of nested function frames, counting the program"),
+    ('runs', 'counter', "Program runs measured")
+]
+
+### METRICS
+
+class Metrics:
+    # Numbers about one or more runs, collected only when a Metrics is
+    # passed to boring.run. Phase times are measured around each phase;
+    # visits and calls are counted by wrapping the runtime's interpreter
+    # and allocations and lookups by runtime's call counters, none of which
+    # exist on a run without metrics. Running several programs with the
+    # same Metrics adds their counts and times up.
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        for name, type_, help_text in METRICS:
+            setattr(self, name, 0)
+
+        self.depth = 0
+        self.phase_start = None
+        self.wrappings = None
+        self.runtime = None
+        self.start_allocations = 0
+        self.start_lookups = 0
+
+    def start(self):
+        self.phase_start = self.clock()
+
+    def stop(self, phase):
+        name = f'{phase}_seconds'
+        setattr(self, name, getattr(self, name) + self.clock() - self.phase_start)
+
+    def count_tokens(self, tokens):
+        self.tokens += len(tokens)
+
+    def count_nodes(self, tree):
+        self.nodes += sum(1 for node in iter_nodes(tree))
+
+    ####
+
+    def attach(self, runtime):
+        allocations.acquire()
+        lookups.acquire()
+        self.start_allocations = allocations.count(runtime)
+        self.start_lookups = lookups.count(runtime)
+
+        self.runtime = runtime
+        self.depth = 1
+        self.peak_context_depth = max(self.peak_context_depth, 1)
+        self.wrappings = [
+            runtime.wrap('visit', self.wrap_visit),
+            runtime.wrap('visit_body', self.wrap_visit_body)
+        ]
+        self.runs += 1
+        return self
+
+    def detach(self):
+        if self.runtime is None: return
+
+        for wrapping in reversed(self.wrappings):
+            self.runtime.unwrap(wrapping)
+        self.values_allocated += allocations.count(self.runtime) - self.start_allocations
+        self.symbol_lookups += lookups.count(self.runtime) - self.start_lookups
+        allocations.release()
+        lookups.release()
+        self.runtime = None
+        self.wrappings = None
+
+    def wrap_visit(self, visit):
+        def counted_visit(node, context):
+            self.node_visits += 1
+            return visit(node, context)
+        return counted_visit
+
+    def wrap_visit_body(self, visit_body):
+        def counted_visit_body(node, context):
+            self.function_calls += 1
+            self.depth += 1
+            if self.depth > self.peak_context_depth:
+                self.peak_context_depth = self.depth
+            try:
+                return visit_body(node, context)
+            finally:
+                self.depth -= 1
+        return counted_visit_body
+
+    ####
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name, type_, help_text in METRICS}
+
+    def __repr__(self):
+        return f'<metrics {self.as_dict()}>'
+
+### PROMETHEUS
+
+def prometheus_text(metrics, prefix='boring', labels=None):
+    # the metrics in the Prometheus text exposition format; labels is a dict
+    # added to every sample, e.g. {'script': 'report.bl'}
+    label_text = ''
+    if labels:
+        pairs = ','.join(f'{key}="{escape_label(str(value))}"' for key, value in labels.items())
+        label_text = '{' + pairs + '}'
+
+    lines = []
+    for name, type_, help_text in METRICS:
+        full_name = f'{prefix}_{name}_total' if type_ == 'counter' else f'{prefix}_{name}'
+        lines.append(f'# HELP {full_name} {help_text}')
+        lines.append(f'# TYPE {full_name} {type_}')
+        lines.append(f'{full_name}{label_text} {getattr(metrics, name)}')
+    return "\n".join(lines) + "\n"
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
\ No newline at end of file
@@ -0,0 +1,53 @@
+import io
+import sys
+import time
+from bits.constants import OUTPUT_BUFFER_SIZE, OUTPUT_FLUSH_INTERVAL
+
+### OUTPUT
+
+class OutputSink:
+    # Where print() writes for one runtime. Output is collected and written
+    # to the stream in one go once buffer_size characters are waiting, when a
+    # print comes flush_interval seconds or more after the last write, when
+    # the program calls flush() or clear() or waits for input or sleep(),
+    # and at the end of the run. buffer_size 0 writes every print straight
+    # away.
+    #
+    # The interval is only looked at when something is printed, not while
+    # the program computes: output printed before a long stretch without
+    # prints waits until the next print, flush() or the end of the run.
+    # Checking the clock on every step would slow down every run for the
+    # sake of programs that print rarely, which can call flush() instead.
+    #
+    # The stream is sys.stdout as it is at the time of writing unless one
+    # is given; capture=True collects the output in memory for getvalue().
+    def __init__(self, stream=None, buffer_size=OUTPUT_BUFFER_SIZE, flush_interval=OUTPUT_FLUSH_INTERVAL, capture=False, clock=time.monotonic):
+        self.stream = io.StringIO() if capture else stream
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.pending = []
+        self.size = 0
+        self.last_flush = clock()
+
+    def write(self, text):
+        self.pending.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size or self.clock() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.last_flush = self.clock()
+        if not self.pending: return
+
+        stream = self.stream or sys.stdout
+        text = ''.join(self.pending)
+        self.pending = []
+        self.size = 0
+        stream.write(text)
+        stream.flush()
+
+    def getvalue(self):
+        # everything printed so far, for a capturing sink
+        self.flush()
+        return self.stream.getvalue()
\ No newline at end of file
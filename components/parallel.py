@@ -0,0 +1,166 @@
+import os
+import sys
+import copy
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from bits.misc import SymbolTable
+from values.types import String
+from values.marshal import dumps, loads, MarshalError
+
+BACKENDS = ('auto', 'interpreters', 'threads', 'processes')
+
+def free_threaded():
+    # True on a CPython build running without the GIL
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+def interpreter_pool():
+    # the sub-interpreter executor of Python 3.14+, each worker with its own GIL
+    try:
+        from concurrent.futures import InterpreterPoolExecutor
+    except ImportError:
+        return None
+    return InterpreterPoolExecutor
+
+def choose_backend(backend='auto'):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend '{backend}', expected one of {', '.join(BACKENDS)}")
+    if backend != 'auto': return backend
+
+    if free_threaded(): return 'threads'
+    if interpreter_pool(): return 'interpreters'
+    if 'fork' in multiprocessing.get_all_start_methods(): return 'processes'
+    return 'threads'
+
+### PROGRAM CACHE
+
+class ProgramCache:
+    # Analysed syntax trees by filename and source, so a program run many
+    # times is lexed, parsed and analysed once. Only compiling is shared:
+    # a run writes to the tree it runs (literal values and operator sites
+    # cached on its nodes, and the frames of inlined calls), so runs at the
+    # same time must not share a tree. The trees kept here are never run.
+    # Forked processes run their inherited copy of them, and each thread
+    # runs a deep copy of its own from thread_copy(), made the first time
+    # that thread runs the program and reused after that.
+    def __init__(self):
+        self.programs = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def get(self, filename, text):
+        # (node, error) as returned by boring.compile_program
+        import boring
+        key = (filename, text)
+        program = self.programs.get(key)
+        if program is None:
+            program = boring.compile_program(filename, text)
+            with self.lock:
+                program = self.programs.setdefault(key, program)
+        return program
+
+    def thread_copy(self, filename, text):
+        # the program for the calling thread alone
+        copies = self.local.__dict__.setdefault('copies', {})
+        key = (filename, text)
+        program = copies.get(key)
+        if program is None:
+            node, error = self.get(filename, text)
+            program = copies[key] = (copy.deepcopy(node) if node else None, error)
+        return program
+
+program_cache = ProgramCache()
+
+### RESULTS
+
+def execute(program, limits):
+    # runs one compiled program with a runtime and variables of its own;
+    # (value, error text)
+    import boring
+    node, error = program
+    value = None
+    if error is None:
+        symbol_table = SymbolTable(boring.global_symbol_table)
+        value, error = boring.execute_program(node, None, None, limits.copy() if limits else None, symbol_table)
+    return value, error.as_string() if error else None
+
+def encode(result):
+    # values cross into other interpreters and processes marshalled, with
+    # functions and other values that have no encoding as their repr; a
+    # value that still cannot be marshalled fails only its own program
+    value, error = result
+    if value is not None:
+        try:
+            value = dumps(value, default=lambda unencodable: String(repr(unencodable)))
+        except MarshalError as marshal_error:
+            return None, f"The result could not be sent back: {marshal_error}"
+    return value, error
+
+def decode(result):
+    value, error = result
+    return (loads(value) if value is not None else None), error
+
+def run_source(filename, text, limits):
+    # what a thread or sub-interpreter worker runs; a sub-interpreter has a
+    # program_cache of its own, and compiles the program itself
+    return encode(execute(program_cache.thread_copy(filename, text), limits))
+
+# the programs a process pool runs; workers forked from the parent inherit
+# them, so neither sources nor trees are pickled
+forked_programs = []
+
+def run_forked(index, limits):
+    return encode(execute(forked_programs[index], limits))
+
+### PARALLEL RUNNER
+
+class ParallelRunner:
+    # Runs independent programs at the same time, each in its own runtime
+    # with its own variables on top of the global ones.
+    #
+    # Backends:
+    #   interpreters  sub-interpreters with a GIL each (Python 3.14+). Objects
+    #                 cannot be shared between interpreters, so every worker
+    #                 keeps its own program cache
+    #   threads       one thread per worker, each running its own copy of the
+    #                 trees compiled once for all of them; runs in parallel
+    #                 only on a free-threaded build
+    #   processes     forked workers, which inherit the trees compiled in the
+    #                 parent copy-on-write
+    # 'auto' picks the first that runs in parallel on this Python.
+    #
+    # Results are (value, error text) per program, in order. Values come
+    # back through values.marshal on every backend, even threads, so the
+    # results are the same whichever runs them: copies that share nothing
+    # with the run, with functions among them as their repr.
+    def __init__(self, workers=None, backend='auto', limits=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = choose_backend(backend)
+        self.limits = limits
+
+    def run(self, programs):
+        # programs is an iterable of (filename, text)
+        programs = list(programs)
+        if not programs: return []
+
+        workers = min(self.workers, len(programs))
+        if self.backend == 'interpreters':
+            with interpreter_pool()(workers) as pool:
+                results = pool.map(run_source, *zip(*programs), [self.limits] * len(programs))
+                return [decode(result) for result in results]
+
+        if self.backend == 'threads':
+            with ThreadPoolExecutor(workers) as pool:
+                results = pool.map(run_source, *zip(*programs), [self.limits] * len(programs))
+                return [decode(result) for result in results]
+
+        compiled = [program_cache.get(filename, text) for filename, text in programs]
+
+        forked_programs[:] = compiled
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                results = pool.starmap(run_forked, [(index, self.limits) for index in range(len(compiled))])
+                return [decode(result) for result in results]
+        finally:
+            forked_programs.clear()
\ No newline at end of file
@@ -114,6 +114,68 @@ class Parser:
             element_nodes, pos_start, self.current_tok.pos_end.copy()
         ))
 
+    def map_expr(self):
+        res = ParseResult()
+        entry_nodes = []
+        pos_start = self.current_tok.pos_start.copy()
+
+        if not self.current_tok.type == T_LBRACE:
+            return res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Expected '{'"
+            ))
+        
+        res.register_next()
+        self.next()
+
+        if self.current_tok.type == T_RBRACE:
+            res.register_next()
+            self.next()
+        else:
+            entry_nodes.append(res.register(self.map_entry()))
+            if res.error: return res
+            
+            while self.current_tok.type == T_COMMA:
+                res.register_next()
+                self.next()
+
+                entry_nodes.append(res.register(self.map_entry()))
+                if res.error: return res
+            
+            if self.current_tok.type != T_RBRACE:
+                return res.failure(InvalidSyntaxError(
+                    self.current_tok.pos_start, self.current_tok.pos_end,
+                    "Expected ',' or '}'"
+                ))
+            
+            res.register_next()
+            self.next()
+        
+        return res.success(MapNode(
+            entry_nodes, pos_start, self.current_tok.pos_end.copy()
+        ))
+
+    def map_entry(self):
+        res = ParseResult()
+        key_node = res.register(self.expr())
+        if res.error:
+            return res.failure(InvalidSyntaxError(
+            self.current_tok.pos_start, self.current_tok.pos_end, "Expected '}', 'var', 'if', 'for', 'while', 'fn', int, float, string, identifier, '+', '-', '[', '{' or '('"
+            ))
+
+        if self.current_tok.type != T_COLON:
+            return res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Expected ':'"
+            ))
+        
+        res.register_next()
+        self.next()
+
+        value_node = res.register(self.expr())
+        if res.error: return res
+        return res.success((key_node, value_node))
+
     def if_expr(self):
         res = ParseResult()
         all_cases = res.register(self.if_expr_cases("if"))
@@ -247,10 +309,23 @@ class Parser:
         res.register_next()
         self.next()
 
+        if self.current_tok.matches(T_KEYWORD, 'in'):
+            res.register_next()
+            self.next()
+
+            iterable = res.register(self.expr())
+            if res.error: return res
+
+            loop_body = res.register(self.loop_body())
+            if res.error: return res
+
+            body, should_return_null = loop_body
+            return res.success(ForInNode(var_name, iterable, body, should_return_null))
+
         if self.current_tok.type != T_EQUALS:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
-                "Expected '='"
+                "Expected '=' or 'in'"
             ))
         
         res.register_next()
@@ -280,6 +355,15 @@ class Parser:
         else:
             step_value = None
         
+        loop_body = res.register(self.loop_body())
+        if res.error: return res
+
+        body, should_return_null = loop_body
+        return res.success(ForNode(var_name, start_value, end_value, step_value, body, should_return_null))
+
+    def loop_body(self):
+        res = ParseResult()
+
         if not self.current_tok.matches(T_KEYWORD, 'do'):
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
@@ -305,12 +389,12 @@ class Parser:
             res.register_next()
             self.next()
 
-            return res.success(ForNode(var_name, start_value, end_value, step_value, body, True))
+            return res.success((body, True))
 
         body = res.register(self.expr())
         if res.error: return res
 
-        return res.success(ForNode(var_name, start_value, end_value, step_value, body, False))
+        return res.success((body, False))
     
     def while_expr(self):
         res = ParseResult()
@@ -327,47 +411,26 @@ class Parser:
         condition = res.register(self.expr())
         if res.error: return res
 
-        res.register_next()
-        self.next()
-
-        if not self.current_tok.matches(T_KEYWORD, 'do'):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                "Expected 'do'"
-            )) 
-        
-        if self.current_tok.type == T_NEWLINE:
-            res.register_next()
-            self.next()
-
-            body = res.register(self.statements())
-            if res.error: return res
-
-            if not self.current_tok.matches(T_KEYWORD, 'end'):
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected 'end'"
-                ))
-            
-            res.register_next()
-            self.next()
-
-            return res.success(WhileNode(condition, body, True))
-
-        body = res.register(self.expr())
+        loop_body = res.register(self.loop_body())
         if res.error: return res
 
-        return res.success(WhileNode(condition, body, False))
+        body, should_return_null = loop_body
+        return res.success(WhileNode(condition, body, should_return_null))
 
     def power(self):
         return self.bin_op(self.call, (T_POW, ), func_b=self.factor)
     
     def call(self):
         res = ParseResult()
-        atom = res.register(self.atom())
+        node = res.register(self.atom())
         if res.error: return res
 
-        if self.current_tok.type == T_LPAREN:
+        while self.current_tok.type in (T_LPAREN, T_LSQUARE):
+            if self.current_tok.type == T_LSQUARE:
+                node = res.register(self.index(node))
+                if res.error: return res
+                continue
+
             res.register_next()
             self.next()
             arg_nodes = []
@@ -398,8 +461,58 @@ class Parser:
                 res.register_next()
                 self.next()
 
-            return res.success(CallNode(atom, arg_nodes))
-        return res.success(atom)
+            node = CallNode(node, arg_nodes)
+        return res.success(node)
+
+    def index(self, node):
+        res = ParseResult()
+        res.register_next()
+        self.next()
+
+        start_node = None
+        if self.current_tok.type != T_COLON:
+            start_node = res.register(self.expr())
+            if res.error:
+                return res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end, "Expected ':', 'var', 'if', 'for', 'while', 'fn', 'not', int, float, identifier, '+', '-' '[', or '('"
+                ))
+
+        if self.current_tok.type == T_RSQUARE:
+            if not start_node:
+                return res.failure(InvalidSyntaxError(
+                    self.current_tok.pos_start, self.current_tok.pos_end,
+                    "Expected index"
+                ))
+
+            pos_end = self.current_tok.pos_end.copy()
+            res.register_next()
+            self.next()
+            return res.success(IndexNode(node, start_node, pos_end))
+
+        if self.current_tok.type != T_COLON:
+            return res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Expected ':' or ']'"
+            ))
+
+        res.register_next()
+        self.next()
+
+        end_node = None
+        if self.current_tok.type != T_RSQUARE:
+            end_node = res.register(self.expr())
+            if res.error: return res
+
+        if self.current_tok.type != T_RSQUARE:
+            return res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Expected ']'"
+            ))
+
+        pos_end = self.current_tok.pos_end.copy()
+        res.register_next()
+        self.next()
+        return res.success(SliceNode(node, start_node, end_node, pos_end))
 
     def atom(self):
         res = ParseResult()
@@ -439,6 +552,11 @@ class Parser:
             if res.error: return res
             return res.success(list_expr)
 
+        elif tok.type == T_LBRACE:
+            map_expr = res.register(self.map_expr())
+            if res.error: return res
+            return res.success(map_expr)
+
         elif tok.matches(T_KEYWORD, "if"):
             if_expr = res.register(self.if_expr())
             if res.error: return res
@@ -474,6 +592,26 @@ class Parser:
             if res.error: return res
             return res.success(UnaryOpNode(tok, factor))
 
+        if tok.matches(T_KEYWORD, 'spawn'):
+            res.register_next()
+            self.next()
+            call = res.register(self.call())
+            if res.error: return res
+
+            if not isinstance(call, CallNode):
+                return res.failure(InvalidSyntaxError(
+                    call.pos_start, call.pos_end,
+                    "Expected a function call after 'spawn'"
+                ))
+            return res.success(SpawnNode(tok, call))
+
+        if tok.matches(T_KEYWORD, 'await'):
+            res.register_next()
+            self.next()
+            factor = res.register(self.factor())
+            if res.error: return res
+            return res.success(AwaitNode(tok, factor))
+
         return self.power()
 
     def term(self):
@@ -537,6 +675,13 @@ class Parser:
             return res.failure(InvalidSyntaxError(
             self.current_tok.pos_start, self.current_tok.pos_end, "Expected 'var', 'if', 'for', 'while', 'fn', 'not', int, float, identifier, '+', '-', '[' or '('"
             ))
+
+        if isinstance(node, IndexNode) and self.current_tok.type == T_EQUALS:
+            res.register_next()
+            self.next()
+            value_node = res.register(self.expr())
+            if res.error: return res
+            return res.success(IndexAssignNode(node, value_node))
         return res.success(node)
     
     def func_def(self):
@@ -0,0 +1,149 @@
+import time
+from components.runtime import allocations
+
+### PROFILER
+
+class Profiler:
+    # Deterministic profiler for one run. While attached it wraps the
+    # runtime's interpreter: visit_body counts every call of a BoringLang
+    # function, and visit times the program one source line at a time. A
+    # line is timed from the first node evaluated on it until evaluation
+    # moves to another line or frame, so nodes on the same line cost one
+    # attribute check each rather than a clock read.
+    #
+    # Own time and own allocations (values created, see runtime.allocations)
+    # are charged to the line, to the function whose frame it runs in
+    # (Context.display_name) and to the stack of calls leading there, which
+    # is what collapsed() writes out for flamegraph tools.
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.functions = {}    # name -> [calls, total time, own time, own allocations]
+        self.lines = {}        # (filename, line) -> [hits, own time, own allocations]
+        self.stacks = {}       # 'a;b;c' -> own time
+        self.active = {}       # name -> calls of it currently running
+        self.frames = []       # [context, line, start, child time, start allocations, child allocations]
+        self.stack_key = '<program>'
+        self.wrappings = None
+        self.runtime = None
+
+    def attach(self, runtime):
+        allocations.acquire()
+        self.runtime = runtime
+        self.wrappings = [
+            runtime.wrap('visit', self.wrap_visit),
+            runtime.wrap('visit_body', self.wrap_visit_body)
+        ]
+        return self
+
+    def detach(self):
+        if self.runtime is None: return
+
+        for wrapping in reversed(self.wrappings):
+            self.runtime.unwrap(wrapping)
+        allocations.release()
+        self.runtime = None
+        self.wrappings = None
+
+    def wrap_visit(self, visit):
+        frames = self.frames
+        clock = self.clock
+        call_counts = self.runtime.call_counts
+        index = allocations.index
+
+        def profiled_visit(node, context):
+            line = node.pos_start.ln
+            if frames:
+                top = frames[-1]
+                if top[0] is context and top[1] == line:
+                    return visit(node, context)
+
+            frame = [context, line, clock(), 0.0, call_counts[index], 0]
+            frames.append(frame)
+            try:
+                return visit(node, context)
+            finally:
+                frames.pop()
+                elapsed = clock() - frame[2]
+                allocated = call_counts[index] - frame[4]
+                self.record(node.pos_start.filename, line, context.display_name, elapsed - frame[3], allocated - frame[5])
+                if frames:
+                    frames[-1][3] += elapsed
+                    frames[-1][5] += allocated
+
+        return profiled_visit
+
+    def wrap_visit_body(self, visit_body):
+        clock = self.clock
+
+        def profiled_visit_body(node, context):
+            name = context.display_name
+            stats = self.functions.get(name)
+            if stats is None:
+                stats = self.functions[name] = [0, 0.0, 0.0, 0]
+            stats[0] += 1
+
+            # time spent in recursive calls is already part of the outermost one
+            outermost = not self.active.get(name)
+            self.active[name] = self.active.get(name, 0) + 1
+            caller_key = self.stack_key
+            self.stack_key = f'{caller_key};{name}'
+            start = clock()
+            try:
+                return visit_body(node, context)
+            finally:
+                if outermost:
+                    stats[1] += clock() - start
+                self.stack_key = caller_key
+                self.active[name] -= 1
+
+        return profiled_visit_body
+
+    def record(self, filename, line, name, own_time, own_allocations):
+        key = (filename, line)
+        line_stats = self.lines.get(key)
+        if line_stats is None:
+            line_stats = self.lines[key] = [0, 0.0, 0]
+        line_stats[0] += 1
+        line_stats[1] += own_time
+        line_stats[2] += own_allocations
+
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = [0, 0.0, 0.0, 0]
+        stats[2] += own_time
+        stats[3] += own_allocations
+
+        self.stacks[self.stack_key] = self.stacks.get(self.stack_key, 0.0) + own_time
+
+    ####
+
+    def report(self, limit=20):
+        # functions and source lines, most own time first
+        lines = [
+            "Functions (by own time)",
+            f"{'calls':>10} {'total s':>10} {'own s':>10} {'allocs':>10}  function"
+        ]
+        functions = sorted(self.functions.items(), key=lambda item: item[1][2], reverse=True)
+        for name, (calls, total, own, allocated) in functions[:limit]:
+            # the program's top level is never called, so only its own cost is known
+            if calls:
+                lines.append(f"{calls:>10} {total:>10.4f} {own:>10.4f} {allocated:>10}  {name}")
+            else:
+                lines.append(f"{'-':>10} {'-':>10} {own:>10.4f} {allocated:>10}  {name}")
+
+        lines.append("")
+        lines.append("Lines (by own time)")
+        lines.append(f"{'hits':>10} {'own s':>10} {'allocs':>10}  line")
+        source_lines = sorted(self.lines.items(), key=lambda item: item[1][1], reverse=True)
+        for (filename, line), (hits, own, allocated) in source_lines[:limit]:
+            lines.append(f"{hits:>10} {own:>10.4f} {allocated:>10}  {filename}:{line + 1}")
+
+        return "\n".join(lines)
+
+    def collapsed(self):
+        # one 'caller;callee own-microseconds' line per stack, the input
+        # format of flamegraph.pl and speedscope
+        return "\n".join(
+            f"{stack} {round(own * 1e6)}" for stack, own in sorted(self.stacks.items())
+            if round(own * 1e6) > 0
+        )
\ No newline at end of file
@@ -0,0 +1,210 @@
+from values.types import Number, String
+from bits.constants import *
+
+### BINARY OPERATIONS
+
+# the Value method every binary operator dispatches to when no
+# specialised handler applies
+BINARY_METHODS = {
+    T_PLUS : 'added_to',
+    T_MINUS : 'subtracted_by',
+    T_MUL : 'mul_by',
+    T_MOD : 'mod_by',
+    T_DIV : 'div_by',
+    T_FLOORDIV : 'floor_div_by',
+    T_POW : 'to_pow_of',
+    T_EE : 'get_comparison_equals',
+    T_NE : 'get_comparison_notequals',
+    T_LE : 'get_comparison_lessthan',
+    T_GE : 'get_comparison_greaterthan',
+    T_LTE : 'get_comparison_lessthanequals',
+    T_GTE : 'get_comparison_greaterthanequals',
+    'and' : 'and_with',
+    'or' : 'or_with'
+}
+
+def operator_key(op_tok):
+    return op_tok.value if op_tok.type == T_KEYWORD else op_tok.type
+
+### SPECIALISED HANDLERS
+#
+# A handler is only called once the site has checked both operand types,
+# so it skips the isinstance dispatch in values/types.py. Returning None
+# hands the operation back to the generic method, e.g. to report a
+# division by zero. Results are fresh values rather than interned numbers,
+# as the interpreter gives them a position straight away.
+
+def add_numbers(left, right):
+    result = Number(left.value + right.value)
+    result.context = left.context
+    return result
+
+def subtract_numbers(left, right):
+    result = Number(left.value - right.value)
+    result.context = left.context
+    return result
+
+def multiply_numbers(left, right):
+    result = Number(left.value * right.value)
+    result.context = left.context
+    return result
+
+def mod_numbers(left, right):
+    if right.value == 0: return None
+    result = Number(left.value % right.value)
+    result.context = left.context
+    return result
+
+def divide_numbers(left, right):
+    if right.value == 0: return None
+    result = Number(left.value / right.value)
+    result.context = left.context
+    return result
+
+def floor_divide_numbers(left, right):
+    if right.value == 0: return None
+    result = Number(left.value // right.value)
+    result.context = left.context
+    return result
+
+def pow_numbers(left, right):
+    result = Number(left.value ** right.value)
+    result.context = left.context
+    return result
+
+def equal_numbers(left, right):
+    result = Number(int(left.value == right.value))
+    result.context = left.context
+    return result
+
+def not_equal_numbers(left, right):
+    result = Number(int(left.value != right.value))
+    result.context = left.context
+    return result
+
+def less_than_numbers(left, right):
+    result = Number(int(left.value < right.value))
+    result.context = left.context
+    return result
+
+def greater_than_numbers(left, right):
+    result = Number(int(left.value > right.value))
+    result.context = left.context
+    return result
+
+def less_than_equal_numbers(left, right):
+    result = Number(int(left.value <= right.value))
+    result.context = left.context
+    return result
+
+def greater_than_equal_numbers(left, right):
+    result = Number(int(left.value >= right.value))
+    result.context = left.context
+    return result
+
+def and_numbers(left, right):
+    result = Number(int(left.value and right.value))
+    result.context = left.context
+    return result
+
+def or_numbers(left, right):
+    result = Number(int(left.value or right.value))
+    result.context = left.context
+    return result
+
+def concat_strings(left, right):
+    result = String(left.value + right.value)
+    result.context = left.context
+    return result
+
+def equal_strings(left, right):
+    result = Number(int(left.value == right.value))
+    result.context = left.context
+    return result
+
+NUMBERS = (Number, Number)
+STRINGS = (String, String)
+
+SPECIALISED_HANDLERS = {
+    T_PLUS : {NUMBERS: add_numbers, STRINGS: concat_strings},
+    T_MINUS : {NUMBERS: subtract_numbers},
+    T_MUL : {NUMBERS: multiply_numbers},
+    T_MOD : {NUMBERS: mod_numbers},
+    T_DIV : {NUMBERS: divide_numbers},
+    T_FLOORDIV : {NUMBERS: floor_divide_numbers},
+    T_POW : {NUMBERS: pow_numbers},
+    T_EE : {NUMBERS: equal_numbers, STRINGS: equal_strings},
+    T_NE : {NUMBERS: not_equal_numbers},
+    T_LE : {NUMBERS: less_than_numbers},
+    T_GE : {NUMBERS: greater_than_numbers},
+    T_LTE : {NUMBERS: less_than_equal_numbers},
+    T_GTE : {NUMBERS: greater_than_equal_numbers},
+    'and' : {NUMBERS: and_numbers},
+    'or' : {NUMBERS: or_numbers}
+}
+
+### OPERATION SITE
+
+class BinOpSite:
+    # Type feedback for one binary operation in the program. Any engine can
+    # keep one of these per operation: check the guard itself and call
+    # handler() directly for the fast path, and call run() otherwise.
+    #
+    # run() counts how often it sees the same pair of operand types. Once
+    # that pair has been seen QUICKEN_WARMUP times in a row and a specialised
+    # handler exists for it, the handler is installed together with the
+    # guard types. Reaching run() with the handler installed means the guard
+    # failed, which deoptimises the site back to generic dispatch. After
+    # QUICKEN_MAX_DEOPTS deoptimisations the site stays generic for good.
+    #
+    # A site whose operand types were proven statically (see
+    # components/inference.py) is marked proven, and its handler can be
+    # called without checking the guard at all.
+    __slots__ = ('method_name', 'handlers', 'handler', 'left_type', 'right_type', 'count', 'deopts', 'proven')
+
+    def __init__(self, op_tok):
+        key = operator_key(op_tok)
+        self.method_name = BINARY_METHODS[key]
+        self.handlers = SPECIALISED_HANDLERS[key]
+        self.handler = None
+        self.left_type = None
+        self.right_type = None
+        self.count = 0
+        self.deopts = 0
+        self.proven = False
+
+    def prove(self, left_type, right_type):
+        handler = self.handlers.get((left_type, right_type))
+        if handler is None: return
+
+        self.handler = handler
+        self.left_type = left_type
+        self.right_type = right_type
+        self.proven = True
+
+    def run(self, left, right):
+        if self.handler is not None and (type(left) is not self.left_type or type(right) is not self.right_type):
+            self.deoptimise()
+        self.observe(left, right)
+        return getattr(left, self.method_name)(right)
+
+    def observe(self, left, right):
+        if self.handler is not None: return
+
+        if type(left) is not self.left_type or type(right) is not self.right_type:
+            self.left_type = type(left)
+            self.right_type = type(right)
+            self.count = 0
+
+        self.count += 1
+        if self.count >= QUICKEN_WARMUP and self.deopts < QUICKEN_MAX_DEOPTS:
+            self.handler = self.handlers.get((self.left_type, self.right_type))
+            self.count = 0
+
+    def deoptimise(self):
+        self.proven = False
+        self.handler = None
+        self.left_type = None
+        self.right_type = None
+        self.count = 0
+        self.deopts += 1
@@ -0,0 +1,129 @@
+import threading
+import contextvars
+from components.interpreter import Interpreter
+from components.output import OutputSink
+from components.input import stdin
+from components.files import FileAccess
+from bits.results import RTResult
+from bits.error import RuntimeError
+from values.types import Number, String, List, Map, Range
+from bits.misc import SymbolTable
+
+### RUNTIME
+
+class Runtime:
+    # Everything one program run shares: the global symbol table, the
+    # interpreter every function body is evaluated with, the sink its output
+    # is printed to, the source its input is read from and the access its
+    # file builtins have. Instruments such as the profiler hook into a run by
+    # wrapping this interpreter's visit and visit_body methods, so a run
+    # without instruments pays nothing for them.
+    def __init__(self, symbol_table=None, output=None, input=None, files=None):
+        self.symbol_table = symbol_table
+        self.interpreter = Interpreter()
+        self.output = output or OutputSink()
+        self.input = input or stdin    # shared by every run reading stdin
+        self.files = files or FileAccess()
+        self.driver = None    # the AsyncDriver of a run started with boring.run_async
+        self.scheduler = None    # the Scheduler, once the program uses tasks or channels
+        self.limits = None    # the Limits of a run started with limits
+        self.call_counts = [0, 0]    # by the call counters below, while acquired
+
+    def execute(self, node, context):
+        # runs a parsed program with this runtime as the current one
+        token = current.set(self)
+        try:
+            result = self.interpreter.visit(node, context)
+        except RecursionError:
+            # nested too deeply outside of any call, e.g. in a long chain of
+            # inlined ones
+            result = RTResult().failure(RuntimeError(
+                node.pos_start, node.pos_end,
+                "Maximum recursion depth exceeded", context
+            ))
+        finally:
+            if self.scheduler is not None:
+                self.scheduler.shutdown()
+            self.output.flush()
+            error = self.files.close()
+            current.reset(token)
+
+        if error and not result.error:
+            return RTResult().failure(RuntimeError(
+                node.pos_start, node.pos_end,
+                f"Could not finish writing a file: {error}", context
+            ))
+        return result
+
+    def wrap(self, method_name, wrapper):
+        # replaces the interpreter method with wrapper(method) and returns what
+        # unwrap() needs to put it back; unwrap in the reverse order of wrap
+        previous = self.interpreter.__dict__.get(method_name)
+        setattr(self.interpreter, method_name, wrapper(getattr(self.interpreter, method_name)))
+        return method_name, previous
+
+    def unwrap(self, wrapping):
+        method_name, previous = wrapping
+        if previous is None:
+            delattr(self.interpreter, method_name)
+        else:
+            setattr(self.interpreter, method_name, previous)
+
+current = contextvars.ContextVar('boring_runtime')
+default_runtime = Runtime()
+
+def current_runtime():
+    return current.get(default_runtime)
+
+### CALL COUNTERS
+
+class CallCounter:
+    # Counts calls of one method on a few classes while at least one
+    # instrument has acquired it. Acquiring swaps in a counting version of
+    # the method, which is process wide, and releasing restores the
+    # original so uninstrumented runs are not slowed down. A call counts
+    # for the runtime current where it is made, at index in its
+    # call_counts, so runs going on at the same time in other threads or
+    # tasks do not count each other's calls.
+    def __init__(self, index, classes, method_name):
+        self.index = index
+        self.classes = classes
+        self.method_name = method_name
+        self.users = 0
+        self.originals = {}
+        self.lock = threading.Lock()
+
+    def count(self, runtime):
+        return runtime.call_counts[self.index]
+
+    def acquire(self):
+        with self.lock:
+            self.users += 1
+            if self.users > 1: return
+
+            for cls in self.classes:
+                original = cls.__dict__[self.method_name]
+                self.originals[cls] = original
+                setattr(cls, self.method_name, self.counting(original))
+
+    def release(self):
+        with self.lock:
+            self.users -= 1
+            if self.users > 0: return
+
+            for cls, original in self.originals.items():
+                setattr(cls, self.method_name, original)
+            self.originals = {}
+
+    def counting(self, original):
+        index = self.index
+        def counted(instance, *args, **kwargs):
+            current.get(default_runtime).call_counts[index] += 1
+            return original(instance, *args, **kwargs)
+        return counted
+
+# values created; interned numbers are reused, not created
+allocations = CallCounter(0, (Number, String, List, Map, Range), '__init__')
+
+# symbol tables searched, one per table on the way up a scope chain
+lookups = CallCounter(1, (SymbolTable,), 'get')
\ No newline at end of file
@@ -0,0 +1,125 @@
+import sys
+import threading
+from components.interpreter import Interpreter
+
+# code of every interpreter method that evaluates a node in a frame; the
+# innermost one running says where a thread is in its BoringLang program
+NODE_CODES = frozenset(
+    method.__code__ for method in vars(Interpreter).values()
+    if callable(method) and {'node', 'context'} <= set(method.__code__.co_varnames)
+)
+
+SAMPLE_INTERVAL = 0.005
+
+### SAMPLER
+
+class Sampler:
+    # Statistical profiler for long runs. A daemon thread wakes every
+    # interval seconds and records the BoringLang stack of the thread it is
+    # attached to: it finds the innermost node the interpreter is evaluating
+    # and follows that node's Context up through parent and
+    # parent_entry_pos, the same chain a traceback is built from. The
+    # interpreter itself is not touched, so a run costs nothing extra
+    # beyond the time the sampling thread holds the GIL, and the sampler can
+    # be attached to and detached from a running program at any point.
+    #
+    # Each sample is a tuple of (display_name, filename, line) frames,
+    # outermost first.
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = {}    # stack -> times seen
+        self.total = 0
+        self.target = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    def attach(self, thread_id=None):
+        # samples the given thread, or the one calling attach()
+        if self.thread is not None: return self
+
+        self.target = thread_id if thread_id is not None else threading.get_ident()
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.loop, name='boring-sampler', daemon=True)
+        self.thread.start()
+        return self
+
+    def detach(self):
+        if self.thread is None: return
+
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+    def loop(self):
+        while not self.stopping.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        frame = sys._current_frames().get(self.target)
+        stack = stack_of(frame)
+        if stack is None: return
+
+        self.samples[stack] = self.samples.get(stack, 0) + 1
+        self.total += 1
+
+    ####
+
+    def report(self, limit=20):
+        # hot lines by samples taken there, then functions by samples taken
+        # anywhere inside them
+        lines = {}
+        functions = {}
+        for stack, count in self.samples.items():
+            lines[stack[-1]] = lines.get(stack[-1], 0) + count
+            for name in set(frame[0] for frame in stack):
+                functions[name] = functions.get(name, 0) + count
+
+        total = self.total or 1
+        report = [
+            f"{self.total} samples every {self.interval * 1000:g}ms",
+            "",
+            "Hot lines (own samples)",
+            f"{'samples':>10} {'%':>6}  line"
+        ]
+        for (name, filename, line), count in sorted(lines.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            report.append(f"{count:>10} {count * 100 / total:>6.1f}  {filename}:{line} in {name}")
+
+        report.append("")
+        report.append("Functions (samples inside)")
+        report.append(f"{'samples':>10} {'%':>6}  function")
+        for name, count in sorted(functions.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            report.append(f"{count:>10} {count * 100 / total:>6.1f}  {name}")
+
+        return "\n".join(report)
+
+    def collapsed(self):
+        # one 'caller;callee samples' line per stack for flamegraph tools
+        stacks = {}
+        for stack, count in self.samples.items():
+            key = ';'.join(frame[0] for frame in stack)
+            stacks[key] = stacks.get(key, 0) + count
+        return "\n".join(f"{key} {count}" for key, count in sorted(stacks.items()))
+
+def stack_of(frame):
+    # the BoringLang stack of a Python frame, or None outside the interpreter
+    while frame is not None and frame.f_code not in NODE_CODES:
+        frame = frame.f_back
+    if frame is None: return None
+
+    frame_locals = frame.f_locals
+    node = frame_locals.get('node')
+    context = frame_locals.get('context')
+    if node is None or context is None: return None
+
+    stack = []
+    pos = node.pos_start
+    while context is not None:
+        if pos is None:
+            stack.append((context.display_name, None, None))
+        else:
+            stack.append((context.display_name, pos.filename, pos.ln + 1))
+        pos = context.parent_entry_pos
+        context = context.parent
+
+    stack.reverse()
+    return tuple(stack)
\ No newline at end of file
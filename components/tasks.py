@@ -0,0 +1,240 @@
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from bits.constants import TASK_SLICE_STEPS
+
+DEADLOCK = "Deadlock: every task is waiting"
+
+class TaskCancelled(Exception):
+    # raised in a task still running when its program ends, to unwind it
+    pass
+
+### TASKS
+
+class GreenTask:
+    # One 'spawn f(x)'. result is the RTResult of the call once done, or
+    # None if the task was cancelled.
+    __slots__ = ('name', 'function', 'args', 'wakeup', 'done', 'result', 'waiters', 'cancelled')
+
+    def __init__(self, name, function, args, lock):
+        self.name = name
+        self.function = function
+        self.args = args
+        self.wakeup = threading.Condition(lock)
+        self.done = False
+        self.result = None
+        self.waiters = []
+        self.cancelled = False
+
+class ChannelBuffer:
+    # A bounded queue between tasks. Senders wait while it is full and
+    # receivers while it is empty; both are woken to check again whenever
+    # that may have changed.
+    __slots__ = ('capacity', 'items', 'senders', 'receivers', 'closed')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = deque()
+        self.senders = []
+        self.receivers = []
+        self.closed = False
+
+    def send(self, scheduler, value):
+        # None, or why the value could not be sent
+        while True:
+            if self.closed: return "Cannot send on a closed channel"
+
+            if len(self.items) < self.capacity:
+                self.items.append(value)
+                scheduler.wake(self.receivers)
+                return None
+
+            if not scheduler.block(self.senders): return DEADLOCK
+
+    def receive(self, scheduler):
+        # (value, error); the value is None once the channel is closed and empty
+        while True:
+            if self.items:
+                value = self.items.popleft()
+                scheduler.wake(self.senders)
+                return value, None
+
+            if self.closed: return None, None
+            if not scheduler.block(self.receivers): return None, DEADLOCK
+
+    def close(self, scheduler):
+        self.closed = True
+        scheduler.wake(self.senders)
+        scheduler.wake(self.receivers)
+
+### SCHEDULER
+
+class Scheduler:
+    # Runs the green tasks of one program. Every task has a thread for its
+    # interpreter stack, but only the task holding the baton (running)
+    # executes; the others wait on their own condition until it is passed to
+    # them. The baton moves round the run queue (ready) when a task blocks
+    # on a channel or join, finishes, or has taken slice_steps steps
+    # (calls and loop iterations) while others are ready.
+    #
+    # A task calling a blocking builtin such as input() hands the baton on
+    # for the duration, so waits in several tasks overlap. A task that would
+    # block while no other task is ready or doing I/O could never be woken,
+    # and gets a deadlock error instead.
+    #
+    # The program itself is the main task. Tasks still running when it ends
+    # are cancelled.
+    def __init__(self, runtime, slice_steps=TASK_SLICE_STEPS):
+        self.runtime = runtime
+        self.slice_steps = slice_steps
+        self.steps = 0
+        self.lock = threading.Lock()
+        self.ready = deque()
+        self.in_io = set()
+        self.tasks = []
+        self.local = threading.local()
+
+        self.main = GreenTask('<program>', None, None, self.lock)
+        self.local.task = self.main
+        self.running = self.main
+
+        self.wrappings = [
+            runtime.wrap('visit_body', self.wrap_step),
+            runtime.wrap('visit_loop_body', self.wrap_step)
+        ]
+
+    @staticmethod
+    def of(runtime):
+        # the runtime's scheduler, started by the program's first task operation
+        if runtime.scheduler is None:
+            runtime.scheduler = Scheduler(runtime)
+        return runtime.scheduler
+
+    def current(self):
+        return self.local.task
+
+    def spawn(self, function, args):
+        task = GreenTask(function.name, function, args, self.lock)
+        # the task sees the same runtime and limits as the code spawning it
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(self.run_task, task), name=f'boring-task-{task.name}', daemon=True)
+
+        with self.lock:
+            self.tasks.append(task)
+            self.ready.append(task)
+        thread.start()
+        return task
+
+    def run_task(self, task):
+        self.local.task = task
+        result = None
+        try:
+            with self.lock:
+                self.wait_turn(task)
+            result = task.function.execute(task.args)
+        except TaskCancelled:
+            pass
+
+        with self.lock:
+            task.done = True
+            task.result = result
+            self.ready.extend(task.waiters)
+            task.waiters = []
+            self.pass_baton()
+
+    ####
+    # wait_turn, pass_baton and switch are called with the lock held
+
+    def wait_turn(self, task):
+        while self.running is not task:
+            task.wakeup.wait()
+        if task.cancelled and task is not self.main:
+            raise TaskCancelled()
+
+    def pass_baton(self):
+        self.running = None
+        while self.ready:
+            task = self.ready.popleft()
+            if not task.done:
+                self.running = task
+                task.wakeup.notify()
+                return
+
+    def switch(self, task):
+        self.pass_baton()
+        self.wait_turn(task)
+
+    def wake(self, waiters):
+        with self.lock:
+            self.ready.extend(waiters)
+            waiters.clear()
+
+    def block(self, waiters):
+        # parks the running task on waiters until something wakes it;
+        # False when nothing could
+        task = self.current()
+        with self.lock:
+            if not any(not ready.done for ready in self.ready) and not self.in_io:
+                return False
+            waiters.append(task)
+            self.switch(task)
+        return True
+
+    def join(self, task):
+        while not task.done:
+            if not self.block(task.waiters): return False
+        return True
+
+    def yield_turn(self):
+        task = self.current()
+        with self.lock:
+            if not self.ready: return
+            self.ready.append(task)
+            self.switch(task)
+
+    @contextmanager
+    def blocking(self):
+        # lets other tasks run while this one waits outside the interpreter
+        task = self.current()
+        with self.lock:
+            self.in_io.add(task)
+            self.pass_baton()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.in_io.discard(task)
+                if self.running is None:
+                    self.running = task
+                else:
+                    self.ready.append(task)
+                self.wait_turn(task)
+
+    def wrap_step(self, visit):
+        def slicing_visit(node, context):
+            self.steps += 1
+            if self.steps >= self.slice_steps:
+                self.steps = 0
+                if self.ready: self.yield_turn()
+            return visit(node, context)
+        return slicing_visit
+
+    ####
+
+    def shutdown(self):
+        # called by the main task once the program has ended
+        with self.lock:
+            for task in self.tasks:
+                task.cancelled = True
+
+            # tasks waiting for their turn or on a channel unwind now; tasks
+            # in a blocking builtin unwind when it returns
+            self.ready = deque(task for task in self.tasks if not task.done and task not in self.in_io)
+            while any(not task.done for task in self.ready):
+                self.ready.append(self.main)
+                self.switch(self.main)
+
+        for wrapping in reversed(self.wrappings):
+            self.runtime.unwrap(wrapping)
+        self.runtime.scheduler = None
\ No newline at end of file
@@ -1,13 +1,100 @@
+import sys
+import argparse
 import boring
 
-while True:
-    inp = input('boring > ')
-    if inp.strip() == "": continue
-    result, error = boring.run("<stdin>", inp)
-
-    if error: print(error.as_string())
-    elif result:
-        if len(result.elements) == 1:
-            print(repr(result.elements[0]))
-        else:
-            print(repr(result))
\ No newline at end of file
+def read_command():
+    # the next line for the shell, or None at the end of its input. Piped
+    # input is read through the same InputSource as the input builtins,
+    # which read ahead of the line they need, so the shell gets the lines
+    # after what the programs took
+    if sys.stdin.isatty():
+        return input('boring > ')
+    print('boring > ', end='', flush=True)
+    return boring.stdin.read_line()
+
+def repl():
+    while True:
+        inp = read_command()
+        if inp is None: break
+        if inp.strip() == "": continue
+        result, error = boring.run("<stdin>", inp)
+
+        if error: print(error.as_string())
+        elif result:
+            if len(result.elements) == 1:
+                print(repr(result.elements[0]))
+            else:
+                print(repr(result))
+
+def run_file(args):
+    with open(args.file) as f:
+        text = f.read()
+
+    if args.explain_types:
+        report, error = boring.explain(args.file, text)
+        if error:
+            print(error.as_string())
+            return 1
+        print(report)
+        return 0
+
+    profiler = boring.Profiler() if args.profile or args.profile_stacks else None
+    sampler = None
+    if args.sample or args.sample_stacks:
+        sampler = boring.Sampler(args.sample_interval / 1000).attach()
+
+    metrics = boring.Metrics() if args.metrics else None
+    limits = None
+    if args.max_steps or args.timeout or args.max_depth or args.max_memory:
+        limits = boring.Limits(args.max_steps, args.timeout, args.max_depth, args.max_memory)
+
+    try:
+        result, error = boring.run(args.file, text, profile=profiler, metrics=metrics, limits=limits)[:2]
+    finally:
+        if sampler: sampler.detach()
+
+    if metrics:
+        print(boring.prometheus_text(metrics, labels={"script": args.file}), end="", file=sys.stderr)
+
+    if profiler:
+        write_report(profiler, args.profile, args.profile_stacks)
+    if sampler:
+        write_report(sampler, args.sample, args.sample_stacks)
+
+    if error:
+        print(error.as_string())
+        return 1
+    return 0
+
+def write_report(instrument, show_report, stacks_path):
+    if show_report:
+        print(instrument.report(), file=sys.stderr)
+    if stacks_path:
+        with open(stacks_path, "w") as f:
+            f.write(instrument.collapsed() + "\n")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run a BoringLang script, or start the shell without one.")
+    arg_parser.add_argument("file", nargs="?", help="script to run")
+    arg_parser.add_argument("--explain-types", action="store_true", help="print the types proven for the script instead of running it")
+    arg_parser.add_argument("--profile", action="store_true", help="print time, calls and allocations per function and line to stderr")
+    arg_parser.add_argument("--profile-stacks", metavar="PATH", help="write collapsed call stacks for flamegraph tools to PATH")
+    arg_parser.add_argument("--sample", action="store_true", help="sample the running script's stack and print its hot spots to stderr")
+    arg_parser.add_argument("--sample-stacks", metavar="PATH", help="write sampled call stacks for flamegraph tools to PATH")
+    arg_parser.add_argument("--sample-interval", metavar="MS", type=float, default=boring.SAMPLE_INTERVAL * 1000, help="milliseconds between samples (default %(default)g)")
+    arg_parser.add_argument("--metrics", action="store_true", help="print phase times and runtime counters to stderr in the Prometheus text format")
+    arg_parser.add_argument("--max-steps", type=int, metavar="N", help="stop the script after N function calls and loop iterations")
+    arg_parser.add_argument("--timeout", type=float, metavar="SECONDS", help="stop the script after SECONDS")
+    arg_parser.add_argument("--max-depth", type=int, metavar="N", help="stop the script when calls nest more than N deep")
+    arg_parser.add_argument("--max-memory", type=int, metavar="BYTES", help="stop the script once it has created about BYTES of list elements and string characters")
+    args = arg_parser.parse_args()
+
+    if args.file is None:
+        if args.explain_types or args.profile or args.profile_stacks or args.sample or args.sample_stacks or args.metrics:
+            arg_parser.error("--explain-types, --profile, --sample and --metrics need a script")
+        repl()
+    else:
+        sys.exit(run_file(args))
+
+if __name__ == "__main__":
+    main()
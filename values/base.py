@@ -1,13 +1,88 @@
+import threading
+import contextvars
 from bits.results import RTResult
 from bits.misc import *
 from bits.error import *
 
+### ALLOCATION QUOTA
+
+class AllocationQuota:
+    # Roughly how many bytes of list elements and string characters one run
+    # may allocate in total. New List and String values charge it as they
+    # are created, and going over only marks it exceeded, because a
+    # constructor cannot fail; the run's limits report it at the next loop
+    # iteration, call or statement. Loops and builtins that collect a list
+    # element by element charge each element as it is added and fail right
+    # there, and operations that could build a huge value in one go check
+    # allows() first.
+    active = 0    # quotas in force across all runs; values skip the lookup at 0
+    lock = threading.Lock()    # around active, for runs in several threads
+    current = contextvars.ContextVar('boring_allocation_quota', default=None)
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.exceeded = False
+
+    def charge(self, size):
+        # whether the quota is exceeded now
+        self.used += size
+        if self.used > self.limit:
+            self.exceeded = True
+        return self.exceeded
+
+    def allows(self, size):
+        return self.used + size <= self.limit
+
+    def error(self, pos_start, pos_end, context):
+        return RuntimeError(pos_start, pos_end, f"Memory limit of {self.limit} bytes exceeded", context)
+
+    def activate(self):
+        # make this the quota of the current context; returns the token
+        # for deactivate
+        with AllocationQuota.lock:
+            AllocationQuota.active += 1
+        return AllocationQuota.current.set(self)
+
+    def deactivate(self, token):
+        AllocationQuota.current.reset(token)
+        with AllocationQuota.lock:
+            AllocationQuota.active -= 1
+
+def current_quota():
+    # the quota of the running program, or None; cheap while no run has one
+    return AllocationQuota.current.get() if AllocationQuota.active else None
+
+def charge_allocation(size):
+    quota = AllocationQuota.current.get()
+    if quota is not None:
+        quota.charge(size)
+
+def check_allocation(value, size):
+    # an error if making a value of about size bytes would go over the quota
+    if not AllocationQuota.active: return None
+
+    quota = AllocationQuota.current.get()
+    if quota is None or quota.allows(size): return None
+    return quota.error(value.pos_start, value.pos_end, value.context)
+
 ### VALUE
 
+class IterationFailed(Exception):
+    # raised by the iterator of a lazily produced value, such as the
+    # elements of json_items(), when the next element cannot be produced;
+    # loops and builtins over it fail with error
+    def __init__(self, error):
+        super().__init__(error.info)
+        self.error = error
+
 class Value:
+    __slots__ = ('pos_start', 'pos_end', 'context')
+
     def __init__(self):
-        self.set_pos()
-        self.set_context()
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
     
     def set_pos(self, pos_start=None, pos_end=None):
         self.pos_start = pos_start
@@ -50,6 +125,14 @@ class Value:
         return None, self.illegal_operation(other)
     def notted(self):
         return None, self.illegal_operation()
+    def get_index(self, index):
+        return None, self.illegal_operation(index)
+    def set_index(self, index, value):
+        return self.illegal_operation(index)
+    def get_slice(self, start, end):
+        return None, self.illegal_operation()
+    def iterate(self):
+        return None, self.illegal_operation()
     def execute(self, args):
         return RTResult().failure(self.illegal_operation())
     def copy(self):
@@ -66,6 +149,8 @@ class Value:
 ### BASE FUNCTION
 
 class BaseFunction(Value):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         super().__init__()
         self.name = name or "<anonymous>"
@@ -90,10 +175,17 @@ class BaseFunction(Value):
     def populate_args(self, arg_names, args, context):
         for i in range(len(args)):
             arg_name = arg_names[i]
-            arg_value = args[i]
-            arg_value.set_context(context)
+            arg_value = args[i].set_context(context)
             context.symbol_table.set(arg_name, arg_value)
     
+    def batch(self):
+        # what map() and the like call once per element; the arguments are
+        # often a list's own elements, so they are bound as copies
+        return self.execute_copies
+
+    def execute_copies(self, args):
+        return self.execute([arg.copy() for arg in args])
+
     def check_and_populate_args(self, arg_names, args, context):
         res = RTResult()
 
@@ -0,0 +1,133 @@
+import re
+import json
+from .types import Number, String, List, Map, Range
+
+### JSON
+#
+# Text is parsed and written by the json module's C scanner and encoder,
+# and only converted from or to values on the Python side. BoringLang has
+# no booleans, so true and false become 1 and 0, and null becomes null,
+# which is the number 0. Copies of null cannot be told apart from 0, so it
+# is always written back out as 0, never as JSON null.
+
+def to_value(obj):
+    # the value of what json.loads returned
+    if isinstance(obj, str):
+        return String(obj)
+    if obj is None:
+        return Number.null
+    if isinstance(obj, bool):
+        return Number.true if obj else Number.false
+    if isinstance(obj, int):
+        return Number.of(obj)
+    if isinstance(obj, float):
+        return Number(obj)
+    if isinstance(obj, list):
+        return List([to_value(element) for element in obj])
+    return Map({key: to_value(element) for key, element in obj.items()})
+
+def to_json(value, active=None):
+    # what json.dumps writes for a value; ValueError for values JSON cannot
+    # hold, such as functions, and lists or maps that contain themselves
+    if isinstance(value, String):
+        return value.value
+    if isinstance(value, Number):
+        if isinstance(value.value, complex):
+            raise ValueError(f"the complex number {value!r} cannot be written as JSON")
+        return value.value
+    if isinstance(value, Range):
+        return list(value.range)
+    if not isinstance(value, (List, Map)):
+        raise ValueError(f"{value!r} cannot be written as JSON")
+
+    if active is None: active = set()
+    if id(value) in active:
+        raise ValueError("a list or map contains itself")
+    active.add(id(value))
+    if isinstance(value, List):
+        obj = [to_json(element, active) for element in value.elements]
+    else:
+        obj = {key: to_json(element, active) for key, element in value.entries.items()}
+    active.discard(id(value))
+    return obj
+
+def parse(text):
+    # ValueError if text is not one JSON document
+    return to_value(json.loads(text))
+
+def dump(value):
+    return json.dumps(to_json(value), ensure_ascii=False, allow_nan=False)
+
+### STREAMING
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER_START = '-0123456789'
+NUMBER_REST = '.eE+-0123456789'
+LITERALS = ('true', 'false', 'null', '-')
+
+def may_continue(error, text):
+    # whether the text that failed to decode may only have been cut short,
+    # and could still be valid once the next piece is added
+    if error.msg.startswith('Unterminated string'): return True
+    if error.pos >= len(text.rstrip()): return True
+
+    rest = text[error.pos:]
+    if any(literal.startswith(rest) for literal in LITERALS): return True
+    # a \uXXXX escape cut off before its four digits
+    return error.msg.startswith('Invalid \\uXXXX') and len(rest) < 6
+
+def iter_array(chunks):
+    # The elements of a JSON array whose text comes in pieces, decoded one
+    # at a time, so neither the text nor the values of the whole array are
+    # held at once. ValueError if the text is not a JSON array, as soon as
+    # the piece that shows it has been read.
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    text = ''
+    pos = 0
+    ended = False
+    expecting = '['
+
+    while True:
+        pos = WHITESPACE.match(text, pos).end()
+        complete = False
+
+        if pos < len(text):
+            char = text[pos]
+            if expecting == '[':
+                if char != '[': raise ValueError("expected a JSON array")
+                pos += 1
+                expecting = 'first'
+                continue
+
+            if expecting == ',':
+                if char == ']': return
+                if char != ',': raise ValueError(f"expected ',' or ']' in the array, not '{char}'")
+                pos += 1
+                expecting = 'element'
+                continue
+
+            if expecting == 'first' and char == ']': return
+
+            try:
+                obj, end = decoder.raw_decode(text, pos)
+                # a number up to the end of the text, or to a '.' or 'e' at
+                # its end, may go on in the next piece
+                complete = ended or char not in NUMBER_START or (end < len(text) and text[end] not in NUMBER_REST)
+            except json.JSONDecodeError as error:
+                if ended or not may_continue(error, text):
+                    raise ValueError(error.msg)
+
+            if complete:
+                pos = end
+                expecting = ','
+                yield to_value(obj)
+                continue
+
+        elif ended:
+            raise ValueError("the JSON array is not closed")
+
+        chunk = next(chunks, '')
+        ended = not chunk
+        text = text[pos:] + chunk
+        pos = 0
\ No newline at end of file
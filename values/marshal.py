@@ -0,0 +1,322 @@
+import sys
+import struct
+from array import array
+from .types import Number, String, FileString, List, Map, Range
+
+### BINARY FORMAT
+#
+# Every value starts with a one-byte tag:
+#
+#   INT     varint                whole number, zigzag encoded so small
+#                                 negative numbers stay short
+#   FLOAT   8 bytes               IEEE 754 double, little-endian
+#   COMPLEX 16 bytes              real and imaginary part as two doubles
+#   STRING  varint n, n bytes     UTF-8
+#   LIST    varint n, n values
+#   MAP     varint n, n pairs     key value, key value ...
+#   RANGE   3 varints             start, stop, step, zigzag encoded
+#   INTS    varint n, 8n bytes    list of whole numbers as little-endian int64
+#   FLOATS  varint n, 8n bytes    list of floats as little-endian doubles
+#   REF     varint i              the i-th list, map or string of this value
+#                                 again, for shared and circular references
+#
+# Varints hold 7 bits per byte, lowest first, with the top bit set on every
+# byte but the last. A stream is just values one after another, and
+# references only reach back within the value they are part of. null is
+# the number 0 and written as one.
+
+INT, FLOAT, COMPLEX, STRING, LIST, MAP, RANGE, INTS, FLOATS, REF = range(10)
+
+# lists at least this long whose elements are all whole numbers, or all
+# floats, are written packed
+PACKED_MIN = 8
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# bytes collected before an Encoder writes to its stream, and read at once
+# by a Decoder
+STREAM_CHUNK = 1 << 16
+
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+class MarshalError(ValueError):
+    pass
+
+def write_varint(buffer, n):
+    while n > 0x7f:
+        buffer.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+def zigzag(n):
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+def unzigzag(n):
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+def packed_tag(elements):
+    # INTS or FLOATS if the list can be written packed, else None
+    if len(elements) < PACKED_MIN: return None
+
+    kind = None
+    for element in elements:
+        if type(element) is not Number: return None
+
+        value = element.value
+        if type(value) is int:
+            if kind is FLOAT or not INT64_MIN <= value <= INT64_MAX: return None
+            kind = INT
+        elif type(value) is float:
+            if kind is INT: return None
+            kind = FLOAT
+        else:
+            return None
+    return INTS if kind is INT else FLOATS
+
+### ENCODER
+
+class Encoder:
+    # Writes values to a binary stream, or collects them for getvalue() when
+    # there is none. default, if given, is called with any value that has no
+    # encoding, such as a function, and returns one to write instead.
+    def __init__(self, stream=None, default=None):
+        self.stream = stream
+        self.default = default
+        self.buffer = bytearray()
+        self.refs = {}
+
+    def write(self, value):
+        # MarshalError if the value cannot be encoded, with nothing written
+        start = len(self.buffer)
+        self.refs = {}
+        try:
+            self.encode(value)
+        except RecursionError:
+            del self.buffer[start:]
+            raise MarshalError("value is nested too deeply") from None
+        except MarshalError:
+            del self.buffer[start:]
+            raise
+        finally:
+            self.refs = {}
+        if self.stream is not None and len(self.buffer) >= STREAM_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.stream is None: return
+        self.stream.write(self.buffer)
+        self.buffer = bytearray()
+
+    def getvalue(self):
+        return bytes(self.buffer)
+
+    def encode(self, value):
+        buffer = self.buffer
+        cls = type(value)
+        if cls is FileString: cls = String
+
+        if cls is Number:
+            number = value.value
+            if type(number) is int:
+                buffer.append(INT)
+                write_varint(buffer, zigzag(number))
+            elif type(number) is complex:
+                buffer.append(COMPLEX)
+                buffer += struct.pack('<dd', number.real, number.imag)
+            else:
+                buffer.append(FLOAT)
+                buffer += struct.pack('<d', number)
+            return
+
+        if cls is Range:
+            buffer.append(RANGE)
+            for n in (value.range.start, value.range.stop, value.range.step):
+                write_varint(buffer, zigzag(n))
+            return
+
+        if cls not in (String, List, Map):
+            if self.default is None:
+                raise MarshalError(f"cannot encode {value!r}")
+            return self.encode(self.default(value))
+
+        # strings, lists and maps seen before in this value are referenced.
+        # Copies of a list or map share its elements or entries, so those
+        # are what identify it; the object is kept alive with its id, so the
+        # id cannot be reused
+        shared = value.elements if cls is List else value.entries if cls is Map else value
+        ref = self.refs.get(id(shared))
+        if ref is not None:
+            buffer.append(REF)
+            write_varint(buffer, ref[0])
+            return
+        self.refs[id(shared)] = (len(self.refs), shared)
+
+        if cls is String:
+            data = value.value.encode('utf-8')
+            buffer.append(STRING)
+            write_varint(buffer, len(data))
+            buffer += data
+
+        elif cls is List:
+            elements = value.elements
+            tag = packed_tag(elements)
+            buffer.append(tag or LIST)
+            write_varint(buffer, len(elements))
+            if tag is None:
+                for element in elements:
+                    self.encode(element)
+            else:
+                packed = array('q' if tag == INTS else 'd', (element.value for element in elements))
+                if not LITTLE_ENDIAN: packed.byteswap()
+                buffer += packed.tobytes()
+
+        else:
+            buffer.append(MAP)
+            write_varint(buffer, len(value.entries))
+            for key, element in value.entries.items():
+                self.encode(Map.key_to_value(key))
+                self.encode(element)
+
+def dumps(value, default=None):
+    encoder = Encoder(default=default)
+    encoder.write(value)
+    return encoder.getvalue()
+
+def dump(value, stream, default=None):
+    encoder = Encoder(stream, default)
+    encoder.write(value)
+    encoder.flush()
+
+### DECODER
+
+class Decoder:
+    # Reads values from a bytes-like object or a binary stream. Bytes-like
+    # data is read through a memoryview and never copied, and packed number
+    # lists are read straight out of it by casting. A stream is read
+    # STREAM_CHUNK bytes at a time.
+    def __init__(self, source):
+        if hasattr(source, 'read'):
+            self.stream = source
+            self.view = memoryview(b'')
+        else:
+            self.stream = None
+            self.view = memoryview(source).cast('B')
+        self.pos = 0
+        self.refs = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.fill(1): raise StopIteration
+        return self.read()
+
+    def read(self):
+        # the next value; MarshalError if the data ends early or is invalid
+        self.refs = []
+        try:
+            return self.decode()
+        except RecursionError:
+            raise MarshalError("value is nested too deeply") from None
+        finally:
+            self.refs = []
+
+    def fill(self, n):
+        # whether n more bytes are available, reading from the stream if needed
+        if self.pos + n <= len(self.view): return True
+        if self.stream is None: return False
+
+        rest = self.view[self.pos:]
+        chunks = [rest.tobytes()]
+        have = len(rest)
+        while have < n:
+            chunk = self.stream.read(max(STREAM_CHUNK, n - have))
+            if not chunk: break
+            chunks.append(chunk)
+            have += len(chunk)
+
+        self.view = memoryview(b''.join(chunks))
+        self.pos = 0
+        return have >= n
+
+    def take(self, n):
+        if not self.fill(n):
+            raise MarshalError("data ends in the middle of a value")
+        start = self.pos
+        self.pos += n
+        return self.view[start:self.pos]
+
+    def read_varint(self):
+        n = 0
+        shift = 0
+        while True:
+            byte = self.take(1)[0]
+            n |= (byte & 0x7f) << shift
+            if byte < 0x80: return n
+            shift += 7
+
+    def decode(self):
+        tag = self.take(1)[0]
+
+        if tag == INT:
+            return Number.of(unzigzag(self.read_varint()))
+        if tag == FLOAT:
+            return Number(struct.unpack('<d', self.take(8))[0])
+        if tag == COMPLEX:
+            return Number(complex(*struct.unpack('<dd', self.take(16))))
+        if tag == RANGE:
+            return Range(range(*(unzigzag(self.read_varint()) for _ in range(3))))
+        if tag == REF:
+            index = self.read_varint()
+            if index >= len(self.refs):
+                raise MarshalError(f"reference to value {index}, which does not come before it")
+            return self.refs[index]
+
+        if tag == STRING:
+            length = self.read_varint()
+            value = String(str(self.take(length), 'utf-8'))
+            self.refs.append(value)
+            return value
+
+        if tag == INTS or tag == FLOATS:
+            count = self.read_varint()
+            numbers = self.take(count * 8).cast('q' if tag == INTS else 'd')
+            if not LITTLE_ENDIAN:
+                numbers = array(numbers.format, numbers)
+                numbers.byteswap()
+            value = List([Number.of(n) for n in numbers] if tag == INTS else [Number(n) for n in numbers])
+            self.refs.append(value)
+            return value
+
+        if tag == LIST:
+            # registered before its elements, which may refer back to it
+            count = self.read_varint()
+            value = List([])
+            self.refs.append(value)
+            value.elements.extend(self.decode() for _ in range(count))
+            return value
+
+        if tag == MAP:
+            count = self.read_varint()
+            value = Map({})
+            self.refs.append(value)
+            for _ in range(count):
+                key = self.decode()
+                if not Map.is_valid_key(key):
+                    raise MarshalError(f"map key {key!r} is not a number or string")
+                value.entries[key.value] = self.decode()
+            return value
+
+        raise MarshalError(f"unknown tag {tag}")
+
+def loads(data):
+    # the single value encoded in data
+    decoder = Decoder(data)
+    value = decoder.read()
+    if decoder.pos != len(decoder.view):
+        raise MarshalError("data continues after the value")
+    return value
+
+def load(stream):
+    return Decoder(stream).read()
\ No newline at end of file
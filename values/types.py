@@ -1,33 +1,97 @@
 import os
+import time
+import inspect
+import contextlib
+import reprlib
+import operator
+import itertools
+from collections import OrderedDict
 from .base import *
 from bits.error import *
+from bits.nodes import FuncDefNode, VarAccessNode, IndexAssignNode, SpawnNode, AwaitNode, iter_nodes
+from bits.constants import SMALL_INT_MIN, SMALL_INT_MAX, IMPURE_BUILTINS, LIST_ELEMENT_BYTES, BUILTIN_CHECK_ELEMENTS
+
+def check_int_index(value, index, what):
+    if not isinstance(index, Number) or not isinstance(index.value, int):
+        return RuntimeError(
+            index.pos_start, index.pos_end,
+            f"{what} index must be an integer", value.context
+        )
+    return None
+
+def get_slice_bounds(value, start, end, length):
+    bounds = []
+    for bound in (start, end):
+        if bound is None:
+            bounds.append(None)
+            continue
+        error = check_int_index(value, bound, "Slice")
+        if error: return None, None, error
+        bounds.append(bound.value)
+
+    start, stop, _ = slice(*bounds).indices(length)
+    return start, max(start, stop), None
 
 class Number(Value):
+    # A frozen number is shared, by every run for the interned ones and by
+    # every evaluation for a cached literal, so it is never changed in
+    # place: set_pos() and set_context() give it a copy of its own instead.
+    __slots__ = ('value', 'frozen')
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
+        self.frozen = False
+
+    def set_pos(self, pos_start=None, pos_end=None):
+        if self.frozen: return self.copy().set_pos(pos_start, pos_end)
+        self.pos_start = pos_start
+        self.pos_end = pos_end
+        return self
+
+    def set_context(self, context=None):
+        if self.frozen: return self.copy().set_context(context)
+        self.context = context
+        return self
+
+    def freeze(self):
+        self.frozen = True
+        return self
+
+    @staticmethod
+    def of(value):
+        # small integers are shared instead of allocated, like CPython's own
+        if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+            return Number.small_ints[value - SMALL_INT_MIN]
+        return Number(value)
     
     def added_to(self, other):
         if isinstance(other, Number):
-            return Number(self.value + other.value).set_context(self.context), None
+            return Number.of(self.value + other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
     
     def subtracted_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value - other.value).set_context(self.context), None
+            return Number.of(self.value - other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
     
     def mul_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value * other.value).set_context(self.context), None
+            return Number.of(self.value * other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
     
     def mod_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value % other.value).set_context(self.context), None
+            if other.value == 0:
+                return None, RuntimeError(
+                    other.pos_start, other.pos_end, "Division by zero", self.context
+                )
+            return Number.of(self.value % other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
@@ -47,66 +111,66 @@ class Number(Value):
                 return None, RuntimeError(
                     other.pos_start, other.pos_end, "Division by zero", self.context
                 )
-            return Number(self.value // other.value).set_context(self.context), None
+            return Number.of(self.value // other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def to_pow_of(self, other):
         if isinstance(other, Number):
-            return Number(self.value ** other.value).set_context(self.context), None
+            return Number.of(self.value ** other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def get_comparison_equals(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value == other.value)).set_context(self.context), None
+            return (Number.true if self.value == other.value else Number.false).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def get_comparison_notequals(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value != other.value)).set_context(self.context), None
+            return (Number.true if self.value != other.value else Number.false).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def get_comparison_lessthan(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value < other.value)).set_context(self.context), None
+            return (Number.true if self.value < other.value else Number.false).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def get_comparison_greaterthan(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value > other.value)).set_context(self.context), None
+            return (Number.true if self.value > other.value else Number.false).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def get_comparison_lessthanequals(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value <= other.value)).set_context(self.context), None
+            return (Number.true if self.value <= other.value else Number.false).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def get_comparison_greaterthanequals(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value >= other.value)).set_context(self.context), None
+            return (Number.true if self.value >= other.value else Number.false).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def and_with(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value and other.value)).set_context(self.context), None
+            return Number.of(int(self.value and other.value)).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def or_with(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value or other.value)).set_context(self.context), None
+            return Number.of(int(self.value or other.value)).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def notted(self):
-        return Number(1 if self.value == 0 else 0).set_context(self.context), None
+        return (Number.true if self.value == 0 else Number.false).set_context(self.context), None
     
     def copy(self):
         copy = Number(self.value)
@@ -119,14 +183,22 @@ class Number(Value):
 
     def __repr__(self):
         return str(self.value)
-Number.null = Number(0)
-Number.false = Number(0)
-Number.true = Number(1)
+Number.small_ints = [Number(i).freeze() for i in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+Number.null = Number(0).freeze()
+Number.false = Number.of(0)
+Number.true = Number.of(1)
 
 class String(Value):
-    def __init__(self, value):
-        super().__init__()
+    __slots__ = ('value',)
+
+    def __init__(self, value, shared=False):
+        # shared: a copy of a string that was already charged to the quota
+        if AllocationQuota.active and not shared:
+            charge_allocation(len(value))
         self.value = value
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
     
     def added_to(self, other):
         if isinstance(other, String):
@@ -136,24 +208,46 @@ class String(Value):
     
     def mul_by(self, other):
         if isinstance(other, Number):
+            error = check_allocation(self, len(self.value) * max(other.value, 0))
+            if error: return None, error
             return String(self.value * other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_equals(self, other):
         if isinstance(other, String):
-            return Number(int(self.value == other.value)).set_context(self.context), None
+            return (Number.true if self.value == other.value else Number.false).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
     
+    def get_index(self, index):
+        error = check_int_index(self, index, "String")
+        if error: return None, error
+
+        try:
+            return String(self.value[index.value]).set_context(self.context), None
+        except IndexError:
+            return None, RuntimeError(
+                index.pos_start, index.pos_end,
+                "String index out of bounds", self.context
+            )
+
+    def get_slice(self, start, end):
+        start, stop, error = get_slice_bounds(self, start, end, len(self.value))
+        if error: return None, error
+        return String(self.value[start:stop]).set_context(self.context), None
+
+    def iterate(self):
+        return (String(char) for char in self.value), None
+
     def notted(self):
-        return Number(0 if self.is_true() else 1).set_context(self.context), None
+        return (Number.false if self.is_true() else Number.true).set_context(self.context), None
 
     def is_true(self):
         return len(self.value) > 0
     
     def copy(self):
-        copy = String(self.value)
+        copy = String(self.value, True)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
@@ -164,9 +258,79 @@ class String(Value):
     def __repr__(self):
         return f'\'{self.value}\''
 
+class FileString(String):
+    # The text of a large file from read_file(), still memory-mapped until
+    # the program first uses it; copies share the mapping and the text
+    __slots__ = ('file',)
+
+    def __init__(self, file):
+        self.file = file
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
+
+    @property
+    def value(self):
+        if self.file.decoded is None and AllocationQuota.active:
+            charge_allocation(len(self.file.mapping))
+        return self.file.text()
+
+    def copy(self):
+        copy = FileString(self.file)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+class ListView:
+    # a window onto part of another list's elements; slicing returns one of
+    # these so no elements are copied, and writes go through to the original
+    __slots__ = ('elements', 'start', 'stop')
+
+    def __init__(self, elements, start, stop):
+        if isinstance(elements, ListView):
+            start += elements.start
+            stop += elements.start
+            elements = elements.elements
+
+        self.elements = elements
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return max(0, min(self.stop, len(self.elements)) - self.start)
+
+    def __iter__(self):
+        return itertools.islice(self.elements, self.start, self.stop)
+
+    def __getitem__(self, index):
+        return self.elements[self.position(index)]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice) and index == slice(None):
+            self.elements[self.start:self.start + len(self)] = value
+            return
+        self.elements[self.position(index)] = value
+
+    def __mul__(self, other):
+        return list(self) * other
+
+    def position(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(index)
+        return self.start + index
+
 class List(Value):
-    def __init__(self, elements):
+    __slots__ = ('elements',)
+
+    def __init__(self, elements, shared=False):
+        # shared: elements already charged to the quota, those of a copy or
+        # of a view onto a list, or ones charged one by one as they were added
         super().__init__()
+        if AllocationQuota.active and not shared:
+            charge_allocation(len(elements) * LIST_ELEMENT_BYTES)
         self.elements = elements
     
     def execute(self, args):
@@ -178,49 +342,339 @@ class List(Value):
                 "Expected valid list index", self.context
             ))
         
-        if isinstance(args[0], Number):
-            index = args[0].value
-            try:
-                return res.success(self.elements[index])
-            except:
-                return res.failure(RuntimeError(
-                    self.pos_start, self.pos_end,
-                    "List index out of bounds", self.context
-                ))
-        else:
-            return res.failure(Value.illegal_operation(self, args[0]))
+        value, error = self.get_index(args[0])
+        if error: return res.failure(error)
+        return res.success(value)
+
+    def get_index(self, index):
+        error = check_int_index(self, index, "List")
+        if error: return None, error
+
+        try:
+            return self.elements[index.value], None
+        except IndexError:
+            return None, RuntimeError(
+                index.pos_start, index.pos_end,
+                "List index out of bounds", self.context
+            )
+
+    def set_index(self, index, value):
+        error = check_int_index(self, index, "List")
+        if error: return error
+
+        try:
+            self.elements[index.value] = value
+        except IndexError:
+            return RuntimeError(
+                index.pos_start, index.pos_end,
+                "List index out of bounds", self.context
+            )
+        return None
+
+    def get_slice(self, start, end):
+        start, stop, error = get_slice_bounds(self, start, end, len(self.elements))
+        if error: return None, error
+        return List(ListView(self.elements, start, stop), True).set_context(self.context), None
+
+    def iterate(self):
+        return iter(self.elements), None
     
     def added_to(self, other):
+        if isinstance(self.elements, ListView):
+            return List(list(self.elements) + [other]).set_context(self.context), None
+
+        if AllocationQuota.active:
+            charge_allocation(LIST_ELEMENT_BYTES)
         new_list = self.copy()
         new_list.elements.append(other)
         return new_list, None
     
     def mul_by(self, other):
         if isinstance(other, Number):
+            error = check_allocation(self, len(self.elements) * max(other.value, 0) * LIST_ELEMENT_BYTES)
+            if error: return None, error
             return List(self.elements * other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
         
     def notted(self):
-        return Number(0 if len(self.elements) else 1).set_context(self.context), None
+        return (Number.false if len(self.elements) else Number.true).set_context(self.context), None
     
     def is_true(self):
         return len(self.elements) > 0
 
     def copy(self):
-        copy = List(self.elements)
+        copy = List(self.elements, True)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
     
+    # a list inside itself prints as [...], as in Python
+    @reprlib.recursive_repr('[...]')
     def __str__(self):
         return ", ".join([str(x) for x in self.elements])
 
+    @reprlib.recursive_repr('[...]')
     def __repr__(self):
         return f'[{", ".join([str(x) for x in self.elements])}]'
 
 
+class Range(Value):
+    # wraps a Python range, so elements are only created while iterating
+    __slots__ = ('range',)
+
+    def __init__(self, range_):
+        super().__init__()
+        self.range = range_
+
+    def get_index(self, index):
+        error = check_int_index(self, index, "Range")
+        if error: return None, error
+
+        try:
+            return Number.of(self.range[index.value]), None
+        except IndexError:
+            return None, RuntimeError(
+                index.pos_start, index.pos_end,
+                "Range index out of bounds", self.context
+            )
+
+    def get_slice(self, start, end):
+        start, stop, error = get_slice_bounds(self, start, end, len(self.range))
+        if error: return None, error
+        return Range(self.range[start:stop]).set_context(self.context), None
+
+    def iterate(self):
+        return map(Number.of, self.range), None
+
+    def notted(self):
+        return (Number.false if len(self.range) else Number.true).set_context(self.context), None
+
+    def is_true(self):
+        return len(self.range) > 0
+
+    def copy(self):
+        copy = Range(self.range)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def __repr__(self):
+        return f'range({self.range.start}, {self.range.stop}, {self.range.step})'
+
+class Map(Value):
+    # entries maps the raw Python key (str, int or float) straight to the stored
+    # value, so no wrapper object is kept alive per key
+    __slots__ = ('entries',)
+
+    def __init__(self, entries):
+        super().__init__()
+        self.entries = entries
+
+    @staticmethod
+    def is_valid_key(key):
+        return isinstance(key, (Number, String))
+
+    @staticmethod
+    def key_to_value(key):
+        return String(key) if isinstance(key, str) else Number(key)
+
+    def execute(self, args):
+        res = RTResult()
+
+        if len(args) != 1:
+            return res.failure(RuntimeError(
+                self.pos_start, self.pos_end,
+                "Expected valid map key", self.context
+            ))
+
+        value, error = self.get_index(args[0])
+        if error: return res.failure(error)
+        return res.success(value)
+
+    def get_index(self, key):
+        if not Map.is_valid_key(key):
+            return None, RuntimeError(
+                key.pos_start, key.pos_end,
+                "Map keys must be numbers or strings", self.context
+            )
+
+        value = self.entries.get(key.value)
+        if value is None:
+            return None, RuntimeError(
+                key.pos_start, key.pos_end,
+                f"Key {key!r} not found in map", self.context
+            )
+        return value, None
+
+    def set_index(self, key, value):
+        if not Map.is_valid_key(key):
+            return RuntimeError(
+                key.pos_start, key.pos_end,
+                "Map keys must be numbers or strings", self.context
+            )
+
+        self.entries[key.value] = value
+        return None
+
+    def iterate(self):
+        # keys are snapshotted so the loop body may add or delete entries
+        return (Map.key_to_value(key) for key in list(self.entries)), None
+
+    def notted(self):
+        return (Number.false if len(self.entries) else Number.true).set_context(self.context), None
+
+    def is_true(self):
+        return len(self.entries) > 0
+
+    def copy(self):
+        copy = Map(self.entries)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    @reprlib.recursive_repr('{...}')
+    def __str__(self):
+        return ", ".join([f"{key!r}: {value}" for key, value in self.entries.items()])
+
+    def __repr__(self):
+        return f'{{{self.__str__()}}}'
+
+
+def blocking_io():
+    # Wraps a builtin waiting on the outside world: other tasks of the
+    # program run meanwhile, and what was printed before is written out first
+    from components.runtime import current_runtime
+    runtime = current_runtime()
+    runtime.output.flush()
+    scheduler = runtime.scheduler
+    return scheduler.blocking() if scheduler else contextlib.nullcontext()
+
+def iter_lines(source, stream=None):
+    # the lines of an InputSource as strings; stream is closed at the end
+    try:
+        while True:
+            line = source.buffered_line()
+            if line is None:
+                with blocking_io():
+                    line = source.read_line()
+                if line is None: return
+            yield String(line)
+    finally:
+        if stream is not None: stream.close()
+
+def current_scheduler():
+    # the scheduler of the running program, started on first use
+    from components.runtime import current_runtime
+    from components.tasks import Scheduler
+    return Scheduler.of(current_runtime())
+
+class Iterator(Value):
+    # values produced one at a time, such as the lines of read_lines(); it
+    # can be looped over once, and copies share their place in it
+    __slots__ = ('iterator', 'name')
+
+    def __init__(self, iterator, name):
+        super().__init__()
+        self.iterator = iterator
+        self.name = name
+
+    def iterate(self):
+        return self.iterator, None
+
+    def is_true(self):
+        return True
+
+    def copy(self):
+        copy = Iterator(self.iterator, self.name)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def __repr__(self):
+        return f'<iterator {self.name}>'
+
+class Task(Value):
+    # what 'spawn f(x)' returns; copies share the task
+    __slots__ = ('task',)
+
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+
+    def join(self):
+        from components.tasks import DEADLOCK
+        if not current_scheduler().join(self.task):
+            return None, RuntimeError(self.pos_start, self.pos_end, DEADLOCK, self.context)
+
+        result = self.task.result
+        if result is None:
+            return None, RuntimeError(self.pos_start, self.pos_end, "Task was cancelled", self.context)
+        if result.error:
+            return None, result.error
+        return result.value, None
+
+    def is_true(self):
+        return True
+
+    def copy(self):
+        copy = Task(self.task)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def __repr__(self):
+        state = 'done' if self.task.done else 'running'
+        return f'<task {self.task.name} {state}>'
+
+class Channel(Value):
+    # a bounded queue between tasks; copies share the queue
+    __slots__ = ('channel',)
+
+    def __init__(self, channel):
+        super().__init__()
+        self.channel = channel
+
+    def send(self, value):
+        info = self.channel.send(current_scheduler(), value)
+        if info: return RuntimeError(self.pos_start, self.pos_end, info, self.context)
+        return None
+
+    def receive(self):
+        # (value, error); value is None once the channel is closed and empty
+        value, info = self.channel.receive(current_scheduler())
+        if info: return None, RuntimeError(self.pos_start, self.pos_end, info, self.context)
+        return value, None
+
+    def close(self):
+        self.channel.close(current_scheduler())
+
+    def iterate(self):
+        # 'for x in channel' receives until the channel is closed and empty;
+        # a receive that fails, e.g. because it would deadlock, fails the loop
+        def receive_all():
+            while True:
+                value, error = self.receive()
+                if error: raise IterationFailed(error)
+                if value is None: return
+                yield value
+        return receive_all(), None
+
+    def is_true(self):
+        return True
+
+    def copy(self):
+        copy = Channel(self.channel)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def __repr__(self):
+        return f'<channel {len(self.channel.items)}/{self.channel.capacity}>'
+
 class Function(BaseFunction):
+    __slots__ = ('body_node', 'arg_names', 'should_return_null')
+
     def __init__(self, name, body_node, arg_names, should_return_null):
         super().__init__(name)
         self.body_node = body_node
@@ -229,16 +683,41 @@ class Function(BaseFunction):
     
     def execute(self, args):
         res = RTResult()
-        from components.interpreter import Interpreter
-        interpreter = Interpreter()
+        from components.runtime import current_runtime
+        interpreter = current_runtime().interpreter
         new_context = self.generate_new_context()
 
         res.register(self.check_and_populate_args(self.arg_names, args, new_context))
         if res.error: return res
 
-        value = res.register(interpreter.visit(self.body_node, new_context))
+        value = res.register(interpreter.visit_body(self.body_node, new_context))
         if res.error: return res
         return res.success(Number.null if self.should_return_null else value)
+
+    def batch(self):
+        # closures would capture the reused frame, so they get a fresh one per call
+        if any(isinstance(node, FuncDefNode) for node in iter_nodes(self.body_node)):
+            return super().batch()
+
+        from components.runtime import current_runtime
+        interpreter = current_runtime().interpreter
+        context = self.generate_new_context()
+        symbols = context.symbol_table.symbols
+
+        def call(args):
+            res = RTResult()
+            res.register(self.check_args(self.arg_names, args))
+            if res.error: return res
+
+            symbols.clear()
+            for arg_name, arg_value in zip(self.arg_names, args):
+                symbols[arg_name] = arg_value.copy().set_context(context)
+
+            value = res.register(interpreter.visit_body(self.body_node, context))
+            if res.error: return res
+            return res.success(Number.null if self.should_return_null else value)
+
+        return call
     
     def copy(self):
         copy = Function(self.name, self.body_node, self.arg_names, self.should_return_null)
@@ -249,7 +728,168 @@ class Function(BaseFunction):
     def __repr__(self):
         return f'<function {self.name}>'
     
+class MemoCache:
+    # least recently used results of one memoized function
+    __slots__ = ('entries', 'capacity', 'hits', 'misses')
+
+    def __init__(self, capacity):
+        self.entries = OrderedDict()
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_of(value):
+        # numbers and strings by value, lists by structure at call time,
+        # anything else by identity (the key keeps the value alive)
+        if isinstance(value, Number): return ('n', value.value)
+        if isinstance(value, String): return ('s', value.value)
+        if isinstance(value, List):
+            return ('l',) + tuple(MemoCache.key_of(element) for element in value.elements)
+        return ('o', value)
+
+    def lookup(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def store(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+class MemoFunction(BaseFunction):
+    __slots__ = ('function', 'cache')
+
+    def __init__(self, function, cache):
+        super().__init__(function.name)
+        self.function = function
+        self.cache = cache
+
+    @staticmethod
+    def find_impurity(function, checked=None):
+        # returns why the function is not pure, or None when it looks pure
+        checked = checked or set()
+        checked.add(function.body_node)
+        outer = function.context.symbol_table if function.context else None
+
+        for node in iter_nodes(function.body_node):
+            if isinstance(node, IndexAssignNode):
+                return "it assigns into a list or map"
+
+            if isinstance(node, (SpawnNode, AwaitNode)):
+                return "it spawns or awaits tasks"
+
+            # any use of a function counts, not just calls: one passed on,
+            # e.g. to map(), is called all the same
+            if isinstance(node, VarAccessNode) and node.var_name_tok.value not in function.arg_names:
+                name = node.var_name_tok.value
+                callee = outer.get(name) if outer else None
+
+                if isinstance(callee, BuiltInFunction) and callee.name in IMPURE_BUILTINS:
+                    return f"it uses {name}()"
+                # a Python coroutine may do anything, and waits on the event loop
+                if isinstance(callee, AsyncBuiltInFunction):
+                    return f"it uses {name}()"
+                if isinstance(callee, Function) and callee.body_node not in checked:
+                    reason = MemoFunction.find_impurity(callee, checked)
+                    if reason: return f"it uses {name}(), and {reason}"
+        return None
+
+    def execute(self, args):
+        res = RTResult()
+        key = tuple(MemoCache.key_of(arg) for arg in args)
+
+        value = self.cache.lookup(key)
+        if value is not None:
+            return res.success(value)
+
+        self.function.set_pos(self.pos_start, self.pos_end)
+        value = res.register(self.function.execute(args))
+        if res.error: return res
+
+        self.cache.store(key, value)
+        return res.success(value)
+
+    def copy(self):
+        copy = MemoFunction(self.function, self.cache)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+    def __repr__(self):
+        return f'<memoized function {self.name}>'
+
+class AsyncBuiltInFunction(BaseFunction):
+    # A builtin implemented by a Python coroutine function, for runs started
+    # with boring.run_async. It is called with the argument values and
+    # returns a value, or a Python number, string or None. The run waits for
+    # it while the event loop goes on with other work.
+    __slots__ = ('coroutine_function', 'arg_names')
+
+    def __init__(self, name, coroutine_function, arg_names=None):
+        super().__init__(name)
+        self.coroutine_function = coroutine_function
+        if arg_names is None:
+            arg_names = list(inspect.signature(coroutine_function).parameters)
+        self.arg_names = arg_names
+
+    def execute(self, args):
+        res = RTResult()
+        res.register(self.check_args(self.arg_names, args))
+        if res.error: return res
+
+        from components.runtime import current_runtime
+        driver = current_runtime().driver
+        if driver is None:
+            return res.failure(RuntimeError(
+                self.pos_start, self.pos_end,
+                f"{self.name}() can only be called in a run started with boring.run_async", self.context
+            ))
+
+        try:
+            awaitable = self.coroutine_function(*args)
+        except Exception as error:
+            # raised before there was a coroutine to wait for
+            value, exception = None, error
+        else:
+            value, exception = driver.wait_for(awaitable)
+        if exception is not None:
+            return res.failure(RuntimeError(
+                self.pos_start, self.pos_end,
+                f"{self.name}() failed: {exception}", self.context
+            ))
+
+        if value is None:
+            value = Number.null
+        elif isinstance(value, (int, float)):
+            value = Number.of(value) if isinstance(value, int) else Number(value)
+        elif isinstance(value, str):
+            value = String(value)
+        elif not isinstance(value, Value):
+            return res.failure(RuntimeError(
+                self.pos_start, self.pos_end,
+                f"{self.name}() returned {type(value).__name__}, which is not a value", self.context
+            ))
+        return res.success(value)
+
+    def copy(self):
+        copy = AsyncBuiltInFunction(self.name, self.coroutine_function, self.arg_names)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+    def __repr__(self):
+        return f'<async built-in function {self.name}>'
+
 class BuiltInFunction(BaseFunction):
+    __slots__ = ()
+
     def __init__(self, name):
         super().__init__(name)
     
@@ -263,7 +903,10 @@ class BuiltInFunction(BaseFunction):
         res.register(self.check_and_populate_args(method.arg_names, args, context))
         if res.error: return res
 
-        return_val = res.register(method(context))
+        try:
+            return_val = res.register(method(context))
+        except IterationFailed as failed:
+            return res.failure(failed.error)
         if res.error: return res
 
         return res.success(return_val)
@@ -281,21 +924,30 @@ class BuiltInFunction(BaseFunction):
         return f'<built-in function {self.name}>'
     
     def execute_print(self, context):
-        print(str(context.symbol_table.get('value')))
+        from components.runtime import current_runtime
+        current_runtime().output.write(str(context.symbol_table.get('value')) + '\n')
         return RTResult().success(Number.null)
     execute_print.arg_names = ['value']
 
+    def execute_flush(self, context):
+        from components.runtime import current_runtime
+        current_runtime().output.flush()
+        return RTResult().success(Number.null)
+    execute_flush.arg_names = []
+
     def execute_print_ret(self, context):
         return RTResult().success(String(str(context.symbol_table.get('value'))))
     execute_print_ret.arg_names = ['value']
 
     def execute_input(self, context):
-        text = input()
+        text, error = self.read_line(context)
+        if error: return RTResult().failure(error)
         return RTResult().success(String(text))
     execute_input.arg_names = []
 
     def execute_input_int(self, context):
-        text = input()
+        text, error = self.read_line(context)
+        if error: return RTResult().failure(error)
         try:
             n = int(text)
         except ValueError:
@@ -303,16 +955,709 @@ class BuiltInFunction(BaseFunction):
                 self.pos_start.copy(), self.pos_end.copy(),
                 "Given input could not be converted to number.", context
             ))
-        return RTResult().success(Number(n))
+        return RTResult().success(Number.of(n))
     execute_input_int.arg_names = []
     
     def execute_clear(self, context):
-        os.system('cls' if os.name == "nt" else 'clear')
+        # what was printed before has to reach the terminal before it is cleared
+        with blocking_io():
+            os.system('cls' if os.name == "nt" else 'clear')
         return RTResult().success(Number.null)
     execute_clear.arg_names = []
 
+    def execute_sleep(self, context):
+        seconds = context.symbol_table.get('seconds')
+        if not isinstance(seconds, Number) or seconds.value < 0:
+            return RTResult().failure(self.argument_error(
+                seconds, "Argument 'seconds' of sleep() must be a number of at least 0", context
+            ))
+
+        with blocking_io():
+            time.sleep(seconds.value)
+        return RTResult().success(Number.null)
+    execute_sleep.arg_names = ['seconds']
+
+    ### READING INPUT
+
+    def read_line(self, context):
+        from components.runtime import current_runtime
+        with blocking_io():
+            text = current_runtime().input.read_line()
+        if text is None:
+            return None, RuntimeError(self.pos_start, self.pos_end, "No more input to read", context)
+        return text, None
+
+    def execute_read_lines(self, context):
+        # the lines are only read as the loop over them gets to them
+        from components.runtime import current_runtime
+        source = current_runtime().input
+
+        return RTResult().success(Iterator(iter_lines(source), 'lines'))
+    execute_read_lines.arg_names = []
+
+    def execute_read_all(self, context):
+        from components.runtime import current_runtime
+        with blocking_io():
+            text = current_runtime().input.read_all()
+        return RTResult().success(String(text))
+    execute_read_all.arg_names = []
+
+    def execute_read_ints(self, context):
+        from components.runtime import current_runtime
+        try:
+            with blocking_io():
+                numbers = current_runtime().input.read_ints()
+        except ValueError as error:
+            return RTResult().failure(RuntimeError(self.pos_start, self.pos_end, f"read_ints(): {error}", context))
+        return RTResult().success(List([Number.of(n) for n in numbers]))
+    execute_read_ints.arg_names = []
+
+    ### FILES
+
+    def get_path(self, context):
+        path = context.symbol_table.get('path')
+        if not isinstance(path, String):
+            return None, self.argument_error(path, f"Argument 'path' of {self.name}() must be a string", context)
+        return path.value, None
+
+    def file_error(self, verb, path, error, context):
+        return RuntimeError(
+            self.pos_start, self.pos_end,
+            f"Cannot {verb} '{path}': {error.strerror or error}", context
+        )
+
+    def execute_read_file(self, context):
+        # a large file is mapped, and only decoded once its text is used
+        from components.runtime import current_runtime
+        path, error = self.get_path(context)
+        if error: return RTResult().failure(error)
+
+        try:
+            with blocking_io():
+                text = current_runtime().files.read(path)
+        except (OSError, ValueError) as exception:
+            return RTResult().failure(self.file_error('read', path, exception, context))
+        return RTResult().success(String(text) if isinstance(text, str) else FileString(text))
+    execute_read_file.arg_names = ['path']
+
+    def execute_open_lines(self, context):
+        # the lines of a file, read as the loop over them gets to them
+        from components.runtime import current_runtime
+        from components.input import InputSource
+        path, error = self.get_path(context)
+        if error: return RTResult().failure(error)
+
+        try:
+            f = current_runtime().files.open_text(path)
+        except (OSError, ValueError) as exception:
+            return RTResult().failure(self.file_error('open', path, exception, context))
+        return RTResult().success(Iterator(iter_lines(InputSource(f), f), f'lines of {path}'))
+    execute_open_lines.arg_names = ['path']
+
+    def write_text(self, context, append):
+        from components.runtime import current_runtime
+        path, error = self.get_path(context)
+        if error: return RTResult().failure(error)
+
+        text = context.symbol_table.get('text')
+        if not isinstance(text, String):
+            return RTResult().failure(self.argument_error(
+                text, f"Argument 'text' of {self.name}() must be a string", context
+            ))
+
+        files = current_runtime().files
+        try:
+            with blocking_io():
+                if append:
+                    files.append(path, text.value)
+                else:
+                    files.write(path, text.value)
+        except (OSError, ValueError) as exception:
+            return RTResult().failure(self.file_error('append to' if append else 'write', path, exception, context))
+        return RTResult().success(Number.null)
+
+    def execute_write_file(self, context):
+        return self.write_text(context, False)
+    execute_write_file.arg_names = ['path', 'text']
+
+    def execute_append_file(self, context):
+        return self.write_text(context, True)
+    execute_append_file.arg_names = ['path', 'text']
+
+    ### JSON
+
+    def execute_json_parse(self, context):
+        from values.json_codec import parse
+        text = context.symbol_table.get('text')
+        if not isinstance(text, String):
+            return RTResult().failure(self.argument_error(text, "Argument 'text' of json_parse() must be a string", context))
+
+        try:
+            return RTResult().success(parse(text.value))
+        except (ValueError, RecursionError) as error:
+            return RTResult().failure(self.json_error(error, context))
+    execute_json_parse.arg_names = ['text']
+
+    def execute_json_dump(self, context):
+        from values.json_codec import dump
+        value = context.symbol_table.get('value')
+        try:
+            return RTResult().success(String(dump(value)))
+        except (ValueError, RecursionError) as error:
+            return RTResult().failure(self.json_error(error, context))
+    execute_json_dump.arg_names = ['value']
+
+    def execute_json_items(self, context):
+        # the elements of a JSON array, each parsed as the loop gets to it
+        text = context.symbol_table.get('text')
+        if not isinstance(text, String):
+            return RTResult().failure(self.argument_error(text, "Argument 'text' of json_items() must be a string", context))
+        return RTResult().success(Iterator(self.iter_json_items([text.value], context), 'json items'))
+    execute_json_items.arg_names = ['text']
+
+    def execute_open_json_items(self, context):
+        # like json_items(), reading the file a chunk at a time
+        from components.runtime import current_runtime
+        from bits.constants import INPUT_CHUNK_SIZE
+        path, error = self.get_path(context)
+        if error: return RTResult().failure(error)
+
+        try:
+            f = current_runtime().files.open_text(path)
+        except (OSError, ValueError) as exception:
+            return RTResult().failure(self.file_error('open', path, exception, context))
+
+        def chunks():
+            with f:
+                while True:
+                    with blocking_io():
+                        chunk = f.read(INPUT_CHUNK_SIZE)
+                    if not chunk: return
+                    yield chunk
+        return RTResult().success(Iterator(self.iter_json_items(chunks(), context), f'json items of {path}'))
+    execute_open_json_items.arg_names = ['path']
+
+    def iter_json_items(self, chunks, context):
+        from values.json_codec import iter_array
+        try:
+            yield from iter_array(chunks)
+        except (ValueError, RecursionError) as error:
+            raise IterationFailed(self.json_error(error, context))
+
+    def json_error(self, error, context):
+        if isinstance(error, RecursionError):
+            error = "nested too deeply"
+        return RuntimeError(self.pos_start, self.pos_end, f"{self.name}(): {error}", context)
+
+    ### TASKS AND CHANNELS
+
+    def execute_join(self, context):
+        task = context.symbol_table.get('task')
+        if not isinstance(task, Task):
+            return RTResult().failure(self.argument_error(task, "Argument 'task' of join() must be a task", context))
+
+        value, error = task.join()
+        if error: return RTResult().failure(error)
+        return RTResult().success(value)
+    execute_join.arg_names = ['task']
+
+    def execute_channel(self, context):
+        from components.tasks import ChannelBuffer
+        capacity = context.symbol_table.get('capacity')
+        if not isinstance(capacity, Number) or not isinstance(capacity.value, int) or capacity.value < 1:
+            return RTResult().failure(self.argument_error(
+                capacity, "Argument 'capacity' of channel() must be a whole number of at least 1", context
+            ))
+        return RTResult().success(Channel(ChannelBuffer(capacity.value)))
+    execute_channel.arg_names = ['capacity']
+
+    def get_channel(self, context):
+        channel = context.symbol_table.get('channel')
+        if not isinstance(channel, Channel):
+            return None, self.argument_error(
+                channel, f"Argument 'channel' of {self.name}() must be a channel", context
+            )
+        return channel, None
+
+    def execute_send(self, context):
+        channel, error = self.get_channel(context)
+        if error: return RTResult().failure(error)
+
+        error = channel.send(context.symbol_table.get('value'))
+        if error: return RTResult().failure(error)
+        return RTResult().success(Number.null)
+    execute_send.arg_names = ['channel', 'value']
+
+    def execute_receive(self, context):
+        # null once the channel is closed and empty
+        channel, error = self.get_channel(context)
+        if error: return RTResult().failure(error)
+
+        value, error = channel.receive()
+        if error: return RTResult().failure(error)
+        return RTResult().success(Number.null if value is None else value)
+    execute_receive.arg_names = ['channel']
+
+    def execute_close(self, context):
+        channel, error = self.get_channel(context)
+        if error: return RTResult().failure(error)
+
+        channel.close()
+        return RTResult().success(Number.null)
+    execute_close.arg_names = ['channel']
+
+    ### AGGREGATES
+
+    def argument_error(self, value, info, context):
+        pos_start = value.pos_start or self.pos_start
+        pos_end = value.pos_end or self.pos_end
+        return RuntimeError(pos_start.copy(), pos_end.copy(), info, context)
+
+    def limits_error(self, steps, context):
+        # a RuntimeError if this many more steps go over the run's limits
+        from components.runtime import current_runtime
+        limits = current_runtime().limits
+        info = limits.check(steps) if limits is not None else None
+        if info is None: return None
+        return RuntimeError(self.pos_start, self.pos_end, info, context)
+
+    def limited(self, iterator, context):
+        # the iterator, checking the run's limits every BUILTIN_CHECK_ELEMENTS
+        # elements if it has any
+        from components.runtime import current_runtime
+        if current_runtime().limits is None: return iterator
+        return self.iter_limited(iterator, context)
+
+    def iter_limited(self, iterator, context):
+        for n, element in enumerate(iterator, 1):
+            if n % BUILTIN_CHECK_ELEMENTS == 0:
+                error = self.limits_error(BUILTIN_CHECK_ELEMENTS, context)
+                if error: raise IterationFailed(error)
+            yield element
+
+    def get_iterator(self, context, arg_name):
+        value = context.symbol_table.get(arg_name)
+        iterator, error = value.iterate()
+        if error:
+            return None, self.argument_error(
+                value, f"Argument '{arg_name}' of {self.name}() must be a list, string, map or range", context
+            )
+        return self.limited(iterator, context), None
+
+    def get_numbers(self, context, arg_name):
+        value = context.symbol_table.get(arg_name)
+        if isinstance(value, Range):
+            return value.range, None
+
+        iterator, error = self.get_iterator(context, arg_name)
+        if error: return None, error
+
+        numbers = []
+        for element in iterator:
+            if not isinstance(element, Number):
+                return None, self.argument_error(
+                    value, f"Argument '{arg_name}' of {self.name}() must only contain numbers", context
+                )
+            numbers.append(element.value)
+        return numbers, None
+
+    def number_chunks(self, numbers, context):
+        # A range from get_numbers() in pieces of BUILTIN_CHECK_ELEMENTS, with
+        # the run's limits checked before each, so a native loop over a huge
+        # range can still be stopped. A list is one piece, as its elements
+        # were checked while they were collected.
+        from components.runtime import current_runtime
+        if not isinstance(numbers, range) or current_runtime().limits is None:
+            yield numbers
+            return
+
+        for start in range(0, len(numbers), BUILTIN_CHECK_ELEMENTS):
+            chunk = numbers[start:start + BUILTIN_CHECK_ELEMENTS]
+            error = self.limits_error(len(chunk), context)
+            if error: raise IterationFailed(error)
+            yield chunk
+
+    def sum_numbers(self, numbers, context):
+        # sums left to right across the pieces, like one sum() would
+        total = 0
+        for chunk in self.number_chunks(numbers, context):
+            total = sum(chunk, total)
+        return total
+
+    def get_non_empty_numbers(self, context, arg_name):
+        numbers, error = self.get_numbers(context, arg_name)
+        if error: return None, error
+
+        if len(numbers) == 0:
+            return None, self.argument_error(
+                context.symbol_table.get(arg_name), f"{self.name}() of an empty list", context
+            )
+        return numbers, None
+
+    def execute_sum(self, context):
+        numbers, error = self.get_numbers(context, 'list')
+        if error: return RTResult().failure(error)
+        return RTResult().success(Number.of(self.sum_numbers(numbers, context)))
+    execute_sum.arg_names = ['list']
+
+    def execute_min(self, context):
+        numbers, error = self.get_non_empty_numbers(context, 'list')
+        if error: return RTResult().failure(error)
+        return RTResult().success(Number.of(min(min(chunk) for chunk in self.number_chunks(numbers, context))))
+    execute_min.arg_names = ['list']
+
+    def execute_max(self, context):
+        numbers, error = self.get_non_empty_numbers(context, 'list')
+        if error: return RTResult().failure(error)
+        return RTResult().success(Number.of(max(max(chunk) for chunk in self.number_chunks(numbers, context))))
+    execute_max.arg_names = ['list']
+
+    def execute_mean(self, context):
+        numbers, error = self.get_non_empty_numbers(context, 'list')
+        if error: return RTResult().failure(error)
+        return RTResult().success(Number(self.sum_numbers(numbers, context) / len(numbers)))
+    execute_mean.arg_names = ['list']
+
+    def execute_dot(self, context):
+        a, error = self.get_numbers(context, 'a')
+        if error: return RTResult().failure(error)
+        b, error = self.get_numbers(context, 'b')
+        if error: return RTResult().failure(error)
+
+        if len(a) != len(b):
+            return RTResult().failure(self.argument_error(
+                context.symbol_table.get('b'),
+                f"dot() of lists with different lengths ({len(a)} and {len(b)})", context
+            ))
+
+        if not isinstance(a, range) and not isinstance(b, range):
+            return RTResult().success(Number.of(sum(map(operator.mul, a, b))))
+
+        total = 0
+        for piece in self.number_chunks(range(len(a)), context):
+            total = sum(map(operator.mul, a[piece.start:piece.stop], b[piece.start:piece.stop]), total)
+        return RTResult().success(Number.of(total))
+    execute_dot.arg_names = ['a', 'b']
+
+    def execute_count(self, context):
+        iterator, error = self.get_iterator(context, 'list')
+        if error: return RTResult().failure(error)
+        value = context.symbol_table.get('value')
+
+        value_type = type(value)
+        if value_type not in (Number, String):
+            return RTResult().failure(self.argument_error(
+                value, "Argument 'value' of count() must be a number or a string", context
+            ))
+
+        target = value.value
+        n = 0
+        for element in iterator:
+            if type(element) is value_type and element.value == target:
+                n += 1
+        return RTResult().success(Number.of(n))
+    execute_count.arg_names = ['list', 'value']
+
+    def execute_range(self, context):
+        bounds = []
+        for arg_name in self.execute_range.arg_names:
+            value = context.symbol_table.get(arg_name)
+            if not isinstance(value, Number) or not isinstance(value.value, int):
+                return RTResult().failure(self.argument_error(
+                    value, f"Argument '{arg_name}' of range() must be an integer", context
+                ))
+            bounds.append(value.value)
+
+        if bounds[2] == 0:
+            return RTResult().failure(self.argument_error(
+                context.symbol_table.get('step'), "range() step must not be zero", context
+            ))
+        return RTResult().success(Range(range(*bounds)))
+    execute_range.arg_names = ['start', 'end', 'step']
+
+    ### MEMOIZATION
+
+    def execute_memoize(self, context):
+        function = context.symbol_table.get('fn')
+        size = context.symbol_table.get('size')
+
+        if not isinstance(function, Function):
+            return RTResult().failure(self.argument_error(
+                function, "Argument 'fn' of memoize() must be a user-defined function", context
+            ))
+        if not isinstance(size, Number) or not isinstance(size.value, int) or size.value < 1:
+            return RTResult().failure(self.argument_error(
+                size, "Argument 'size' of memoize() must be a positive integer", context
+            ))
+
+        # passing the function in rebound its context to this call's frame;
+        # it has to outlive this call, so scope it to the caller instead
+        function = function.copy().set_context(context.parent)
+
+        reason = MemoFunction.find_impurity(function)
+        if reason:
+            return RTResult().failure(self.argument_error(
+                function, f"Cannot memoize {function.name}() because {reason}", context
+            ))
+        return RTResult().success(MemoFunction(function, MemoCache(size.value)))
+    execute_memoize.arg_names = ['fn', 'size']
+
+    def execute_memo_stats(self, context):
+        function = context.symbol_table.get('fn')
+        if not isinstance(function, MemoFunction):
+            return RTResult().failure(self.argument_error(
+                function, "Argument 'fn' of memo_stats() must be a memoized function", context
+            ))
+
+        cache = function.cache
+        return RTResult().success(Map({
+            "hits": Number.of(cache.hits),
+            "misses": Number.of(cache.misses),
+            "size": Number.of(len(cache.entries)),
+            "capacity": Number.of(cache.capacity)
+        }))
+    execute_memo_stats.arg_names = ['fn']
+
+    ### MAPS
+
+    def get_map_and_key(self, context):
+        map_ = context.symbol_table.get('map')
+        key = context.symbol_table.get('key')
+        if not isinstance(map_, Map):
+            return None, None, self.argument_error(
+                map_, f"Argument 'map' of {self.name}() must be a map", context
+            )
+        if not Map.is_valid_key(key):
+            return None, None, self.argument_error(
+                key, "Map keys must be numbers or strings", context
+            )
+        return map_, key, None
+
+    def get_map(self, context):
+        map_ = context.symbol_table.get('map')
+        if not isinstance(map_, Map):
+            return None, self.argument_error(
+                map_, f"Argument 'map' of {self.name}() must be a map", context
+            )
+        return map_, None
+
+    def execute_has(self, context):
+        map_, key, error = self.get_map_and_key(context)
+        if error: return RTResult().failure(error)
+        return RTResult().success(Number.true if key.value in map_.entries else Number.false)
+    execute_has.arg_names = ['map', 'key']
+
+    def execute_get(self, context):
+        map_, key, error = self.get_map_and_key(context)
+        if error: return RTResult().failure(error)
+        value = map_.entries.get(key.value)
+        return RTResult().success(context.symbol_table.get('default') if value is None else value)
+    execute_get.arg_names = ['map', 'key', 'default']
+
+    def execute_set(self, context):
+        map_, key, error = self.get_map_and_key(context)
+        if error: return RTResult().failure(error)
+        map_.entries[key.value] = context.symbol_table.get('value')
+        return RTResult().success(map_)
+    execute_set.arg_names = ['map', 'key', 'value']
+
+    def execute_delete(self, context):
+        map_, key, error = self.get_map_and_key(context)
+        if error: return RTResult().failure(error)
+        value = map_.entries.pop(key.value, None)
+        if value is None:
+            return RTResult().failure(self.argument_error(
+                key, f"Key {key!r} not found in map", context
+            ))
+        return RTResult().success(value)
+    execute_delete.arg_names = ['map', 'key']
+
+    def execute_keys(self, context):
+        map_, error = self.get_map(context)
+        if error: return RTResult().failure(error)
+        return RTResult().success(List([Map.key_to_value(key) for key in map_.entries]))
+    execute_keys.arg_names = ['map']
+
+    def execute_values(self, context):
+        map_, error = self.get_map(context)
+        if error: return RTResult().failure(error)
+        return RTResult().success(List(list(map_.entries.values())))
+    execute_values.arg_names = ['map']
+
+    def execute_items(self, context):
+        map_, error = self.get_map(context)
+        if error: return RTResult().failure(error)
+        return RTResult().success(List([
+            List([Map.key_to_value(key), value]) for key, value in map_.entries.items()
+        ]))
+    execute_items.arg_names = ['map']
+
+    ### HIGHER ORDER
+
+    def get_function(self, context, fn_name):
+        fn = context.symbol_table.get(fn_name)
+        if not isinstance(fn, BaseFunction):
+            return None, self.argument_error(
+                fn, f"Argument '{fn_name}' of {self.name}() must be a function", context
+            )
+        return fn, None
+
+    def get_iterator_and_function(self, context):
+        iterator, error = self.get_iterator(context, 'list')
+        if error: return None, None, error
+        fn, error = self.get_function(context, 'fn')
+        if error: return None, None, error
+        return iterator, fn, None
+
+    def sort_values(self, elements, keys, context, list_):
+        # the sort itself runs natively, so its elements count against the
+        # run's limits up front
+        error = self.limits_error(len(elements), context)
+        if error: return None, error
+
+        key_type = type(keys[0]) if keys else Number
+        if key_type not in (Number, String) or any(type(key) is not key_type for key in keys):
+            return None, self.argument_error(
+                list_, f"{self.name}() needs sort keys that are all numbers or all strings", context
+            )
+
+        # keys are computed once per element; sorted() is a stable Timsort over them
+        raw_keys = [key.value for key in keys]
+        order = sorted(range(len(elements)), key=raw_keys.__getitem__)
+        return [elements[i] for i in order], None
+
+    def collect(self, elements, value, quota, context):
+        # adds value to the list a builtin returns, charging it to the memory
+        # quota as it goes; an error once the quota is exceeded
+        elements.append(value)
+        if quota is not None and quota.charge(LIST_ELEMENT_BYTES):
+            return quota.error(self.pos_start, self.pos_end, context)
+        return None
+
+    def execute_map(self, context):
+        res = RTResult()
+        iterator, fn, error = self.get_iterator_and_function(context)
+        if error: return res.failure(error)
+
+        call = fn.batch()
+        elements = []
+        quota = current_quota()
+        for element in iterator:
+            value = res.register(call([element]))
+            if res.error: return res
+            error = self.collect(elements, value, quota, context)
+            if error: return res.failure(error)
+        return res.success(List(elements, shared=True))
+    execute_map.arg_names = ['list', 'fn']
+
+    def execute_filter(self, context):
+        res = RTResult()
+        iterator, fn, error = self.get_iterator_and_function(context)
+        if error: return res.failure(error)
+
+        call = fn.batch()
+        elements = []
+        quota = current_quota()
+        for element in iterator:
+            keep = res.register(call([element]))
+            if res.error: return res
+            if keep.is_true():
+                error = self.collect(elements, element, quota, context)
+                if error: return res.failure(error)
+        return res.success(List(elements, shared=True))
+    execute_filter.arg_names = ['list', 'fn']
+
+    def execute_reduce(self, context):
+        res = RTResult()
+        iterator, fn, error = self.get_iterator_and_function(context)
+        if error: return res.failure(error)
+
+        call = fn.batch()
+        accumulator = context.symbol_table.get('initial')
+        for element in iterator:
+            accumulator = res.register(call([accumulator, element]))
+            if res.error: return res
+        return res.success(accumulator)
+    execute_reduce.arg_names = ['list', 'fn', 'initial']
+
+    def execute_sort(self, context):
+        res = RTResult()
+        list_ = context.symbol_table.get('list')
+        if not isinstance(list_, List):
+            return res.failure(self.argument_error(
+                list_, "Argument 'list' of sort() must be a list", context
+            ))
+        fn, error = self.get_function(context, 'key_fn')
+        if error: return res.failure(error)
+
+        call = fn.batch()
+        keys = []
+        for element in self.limited(list_.elements, context):
+            keys.append(res.register(call([element])))
+            if res.error: return res
+
+        elements, error = self.sort_values(list_.elements, keys, context, list_)
+        if error: return res.failure(error)
+        list_.elements[:] = elements
+        return res.success(list_)
+    execute_sort.arg_names = ['list', 'key_fn']
+
+    def execute_sorted(self, context):
+        iterator, error = self.get_iterator(context, 'list')
+        if error: return RTResult().failure(error)
+
+        values = []
+        quota = current_quota()
+        for value in iterator:
+            error = self.collect(values, value, quota, context)
+            if error: return RTResult().failure(error)
+
+        elements, error = self.sort_values(values, values, context, context.symbol_table.get('list'))
+        if error: return RTResult().failure(error)
+        return RTResult().success(List(elements, shared=True))
+    execute_sorted.arg_names = ['list']
+
 BuiltInFunction.print = BuiltInFunction("print")
 BuiltInFunction.print_ret = BuiltInFunction("print_ret")
+BuiltInFunction.flush = BuiltInFunction("flush")
+BuiltInFunction.read_lines = BuiltInFunction("read_lines")
+BuiltInFunction.read_all = BuiltInFunction("read_all")
+BuiltInFunction.read_ints = BuiltInFunction("read_ints")
+BuiltInFunction.read_file = BuiltInFunction("read_file")
+BuiltInFunction.write_file = BuiltInFunction("write_file")
+BuiltInFunction.append_file = BuiltInFunction("append_file")
+BuiltInFunction.open_lines = BuiltInFunction("open_lines")
+BuiltInFunction.json_parse = BuiltInFunction("json_parse")
+BuiltInFunction.json_dump = BuiltInFunction("json_dump")
+BuiltInFunction.json_items = BuiltInFunction("json_items")
+BuiltInFunction.open_json_items = BuiltInFunction("open_json_items")
 BuiltInFunction.input = BuiltInFunction("input")
 BuiltInFunction.input_int = BuiltInFunction("input_int")
-BuiltInFunction.clear = BuiltInFunction("clear")
\ No newline at end of file
+BuiltInFunction.clear = BuiltInFunction("clear")
+BuiltInFunction.sum = BuiltInFunction("sum")
+BuiltInFunction.min = BuiltInFunction("min")
+BuiltInFunction.max = BuiltInFunction("max")
+BuiltInFunction.mean = BuiltInFunction("mean")
+BuiltInFunction.dot = BuiltInFunction("dot")
+BuiltInFunction.count = BuiltInFunction("count")
+BuiltInFunction.map = BuiltInFunction("map")
+BuiltInFunction.filter = BuiltInFunction("filter")
+BuiltInFunction.reduce = BuiltInFunction("reduce")
+BuiltInFunction.sort = BuiltInFunction("sort")
+BuiltInFunction.sorted = BuiltInFunction("sorted")
+BuiltInFunction.has = BuiltInFunction("has")
+BuiltInFunction.get = BuiltInFunction("get")
+BuiltInFunction.set = BuiltInFunction("set")
+BuiltInFunction.delete = BuiltInFunction("delete")
+BuiltInFunction.keys = BuiltInFunction("keys")
+BuiltInFunction.values = BuiltInFunction("values")
+BuiltInFunction.items = BuiltInFunction("items")
+BuiltInFunction.range = BuiltInFunction("range")
+BuiltInFunction.memoize = BuiltInFunction("memoize")
+BuiltInFunction.memo_stats = BuiltInFunction("memo_stats")
+BuiltInFunction.sleep = BuiltInFunction("sleep")
+BuiltInFunction.join = BuiltInFunction("join")
+BuiltInFunction.channel = BuiltInFunction("channel")
+BuiltInFunction.send = BuiltInFunction("send")
+BuiltInFunction.receive = BuiltInFunction("receive")
+BuiltInFunction.close = BuiltInFunction("close")
\ No newline at end of file